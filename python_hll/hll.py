@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import division
-from copy import deepcopy
-from math import ceil, floor
+from collections import defaultdict
+from math import ceil
+
+import numpy as np
 
 from python_hll.hlltype import HLLType
 from python_hll.serialization import SerializationUtil, HLLMetadata
-from python_hll.util import NumberUtil, BitVector, BitUtil
+from python_hll.util import NumberUtil, BitVector
+
+# mask of the 64 bits of a Java ``long``
+LONG_MASK = 0xFFFFFFFFFFFFFFFF
 
 
-class HLL:
+class HLL(object):
     """
     A probabilistic set of hashed ``long`` elements. Useful for computing
     the approximate cardinality of a stream of data in very small storage.
@@ -50,14 +55,41 @@ class HLL:
     # constructor and parameter names
     MINIMUM_EXPTHRESH_PARAM = -1
     MAXIMUM_EXPTHRESH_PARAM = 18
-    MAXIMUM_EXPLICIT_THRESHOLD = BitUtil.left_shift_int(1, (MAXIMUM_EXPTHRESH_PARAM - 1))  # per storage spec
+    MAXIMUM_EXPLICIT_THRESHOLD = 1 << (MAXIMUM_EXPTHRESH_PARAM - 1)  # per storage spec
+
+    # NOTE:  instances are often held by the million, so no per-instance
+    #        ``__dict__`` is allocated. Each member is described below.
+    __slots__ = (
+        '_explicit_storage', '_sparse_probabilistic_storage', '_probabilistic_storage', '_type', '_add_impl',
+        '_log2m', '_regwidth',
+        '_explicit_off', '_explicit_auto', '_explicit_threshold', '_log2_explicit_threshold',
+        '_short_word_length', '_sparse_off', '_sparse_threshold',
+        '_m', '_m_bits_mask', '_value_mask', '_pw_max_mask', '_alpha_m_squared', '_small_estimator_cutoff', '_large_estimator_cutoff',
+        '_indicator_sum', '_number_of_zeroes',
+        '_cached_bytes', '_cached_schema_version',
+    )
 
     # ------------------------------------------------------------
     # STORAGE
     # :var set _explicit_storage: storage used when ``type`` is EXPLICIT, None otherwise
-    # :var dict _sparse_probabilistic_storage: storage used when ``type`` is SPARSE, None otherwise
+    # :var defaultdict _sparse_probabilistic_storage: storage used when ``type`` is SPARSE, None otherwise
     # :var BitVector _probabilistic_storage: storage used when ``type`` is FULL, None otherwise
     # :var HLLType type: current type of this HLL instance, if this changes then so should the storage used (see above)
+    # :var method _add_impl: the ``add_raw()`` implementation for the current type (see ``_set_type()``)
+
+    # ------------------------------------------------------------
+    # CARDINALITY
+    # Maintained on every register change of a SPARSE or FULL HLL so that ``cardinality()`` needs no scan.
+    # Both are None when unknown (e.g. after the registers were updated in bulk), see ``_compute_indicator()``.
+    # :var long _indicator_sum: the "indicator function" sum(2^(-M[j])) scaled by 2^_value_mask so that it
+    #           is an exact integer, i.e. sum(2^(_value_mask - M[j]))
+    # :var int _number_of_zeroes: the number of registers with value zero ("V" in the paper)
+
+    # ------------------------------------------------------------
+    # SERIALIZATION
+    # Snapshots are often serialized repeatedly without changing in between.
+    # :var list _cached_bytes: the bytes last returned by ``to_bytes()``, None once the HLL has changed
+    # :var SchemaVersion _cached_schema_version: the schema version ``_cached_bytes`` were serialized with
 
     # ------------------------------------------------------------
     # CHARACTERISTIC PARAMETERS
@@ -75,6 +107,8 @@ class HLL:
     # :var int _explicit_threshold: threshold (in element count) at which a EXPLICIT HLL is converted to a
     #           SPARSE or FULL HLL, always greater than or equal to zero and always a power of two OR simply zero
     #           NOTE:  this only has meaning when '_explicit_off' is false
+    # :var int _log2_explicit_threshold: log2(_explicit_threshold) as serialized, zero when '_explicit_off' or
+    #          '_explicit_auto' is true
     # ............................................................
     # SPARSE-specific constants
     # :var int _short_word_length: the computed width of the short words
@@ -123,8 +157,6 @@ class HLL:
                start at. This cannot be ``None``.
         :type type: HLLType
         """
-        from python_hll.hllutil import HLLUtil
-
         self._log2m = log2m
         if log2m < HLL.MINIMUM_LOG2M_PARAM or log2m > HLL.MAXIMUM_EXPLICIT_THRESHOLD:
             raise Exception("'log2m' must be at least " + str(HLL.MINIMUM_LOG2M_PARAM) + " and at most " + str(HLL.MAXIMUM_LOG2M_PARAM) + " (was: " + str(log2m) + ")")
@@ -133,34 +165,37 @@ class HLL:
         if regwidth < HLL.MINIMUM_REGWIDTH_PARAM or regwidth > HLL.MAXIMUM_REGWIDTH_PARAM:
             raise Exception("'regwidth' must be at least " + str(HLL.MINIMUM_REGWIDTH_PARAM) + " and at most " + str(HLL.MAXIMUM_REGWIDTH_PARAM) + " (was: " + str(regwidth) + ")")
 
-        self._m = BitUtil.left_shift_int(1, log2m)
+        self._m = 1 << log2m
         self._m_bits_mask = self._m - 1
-        self._value_mask = BitUtil.left_shift_int(1, regwidth) - 1
-        self._pw_max_mask = HLLUtil.pw_max_mask(regwidth)
-        self._alpha_m_squared = HLLUtil.alpha_m_squared(self._m)
-        self._small_estimator_cutoff = HLLUtil.small_estimator_cutoff(self._m)
-        self._large_estimator_cutoff = HLLUtil.large_estimator_cutoff(log2m, regwidth)
+        self._value_mask = (1 << regwidth) - 1
+        self._pw_max_mask = hllutil.HLLUtil.pw_max_mask(regwidth)
+        self._alpha_m_squared = hllutil.HLLUtil.alpha_m_squared(self._m)
+        self._small_estimator_cutoff = hllutil.HLLUtil.small_estimator_cutoff(self._m)
+        self._large_estimator_cutoff = hllutil.HLLUtil.large_estimator_cutoff(log2m, regwidth)
 
         if expthresh == -1:
             self._explicit_auto = True
             self._explicit_off = False
 
             # NOTE:  This math matches the size calculation in the PostgreSQL impl.
-            full_representation_size = floor((self._regwidth * self._m + 7) / 8)  # round up to next whole byte
-            num_longs = floor(full_representation_size / 8)  # integer division to round down
+            full_representation_size = (self._regwidth * self._m + 7) // 8  # round up to next whole byte
+            num_longs = full_representation_size // 8  # integer division to round down
 
             if num_longs > HLL.MAXIMUM_EXPLICIT_THRESHOLD:
                 self._explicit_threshold = HLL.MAXIMUM_EXPLICIT_THRESHOLD
             else:
                 self._explicit_threshold = num_longs
+            self._log2_explicit_threshold = 0
         elif expthresh == 0:
             self._explicit_auto = False
             self._explicit_off = True
             self._explicit_threshold = 0
+            self._log2_explicit_threshold = 0
         elif 0 < expthresh <= HLL.MAXIMUM_EXPTHRESH_PARAM:
             self._explicit_auto = False
             self._explicit_off = False
-            self._explicit_threshold = BitUtil.left_shift_int(1, (expthresh - 1))
+            self._explicit_threshold = 1 << (expthresh - 1)
+            self._log2_explicit_threshold = expthresh - 1
         else:
             raise Exception("'expthresh' must be at least " + str(HLL.MINIMUM_EXPTHRESH_PARAM) + " and at most " + str(HLL.MAXIMUM_EXPTHRESH_PARAM) + " (was: " + str(expthresh) + ")")
 
@@ -170,9 +205,13 @@ class HLL:
             self._sparse_threshold = 0
         else:
             # TODO improve this cutoff to include the cost overhead of members/objects
-            largest_pow_2_less_than_cutoff = int(NumberUtil.log2((self._m * self._regwidth) / self._short_word_length))
-            self._sparse_threshold = BitUtil.left_shift_int(1, largest_pow_2_less_than_cutoff)
+            largest_pow_2_less_than_cutoff = int(NumberUtil.log2((self._m * self._regwidth) // self._short_word_length))
+            self._sparse_threshold = 1 << largest_pow_2_less_than_cutoff
 
+        self._indicator_sum = None
+        self._number_of_zeroes = None
+        self._cached_bytes = None
+        self._cached_schema_version = None
         self._initialize_storage(type)
 
     @classmethod
@@ -206,6 +245,7 @@ class HLL:
         hll._explicit_threshold = explicit_threshold
         if explicit_threshold < 1 or explicit_threshold > cls.MAXIMUM_EXPLICIT_THRESHOLD:
             raise Exception("'explicit_threshold' must be at least 1 and at most " + str(cls.MAXIMUM_EXPLICIT_THRESHOLD) + " (was: " + str(explicit_threshold) + ")")
+        hll._log2_explicit_threshold = int(NumberUtil.log2(explicit_threshold))
         hll._sparse_off = False
         hll._sparse_threshold = sparse_threshold
         return hll
@@ -230,55 +270,178 @@ class HLL:
                is an excellent hash function for this purpose.
         :rtype: void
         """
+        self._cached_bytes = None
 
-        if self._type == HLLType.EMPTY:
-            # Note: EMPTY type is always promoted on add_raw()
-            if self._explicit_threshold > 0:
-                self._initialize_storage(HLLType.EXPLICIT)
-                self._explicit_storage.add(raw_value)
-            elif not self._sparse_off:
+        # NOTE:  dispatches on the type without branching, see _set_type()
+        self._add_impl(raw_value)
+
+    def _add_raw_empty(self, raw_value):
+        """
+        ``add_raw()`` for a ``HLLType.EMPTY`` HLL.
+
+        :param long raw_value: the value to be added
+        :rtype: void
+        """
+        # Note: EMPTY type is always promoted on add_raw()
+        if self._explicit_threshold > 0:
+            self._initialize_storage(HLLType.EXPLICIT)
+            self._explicit_storage.add(raw_value)
+        elif not self._sparse_off:
+            self._initialize_storage(HLLType.SPARSE)
+            self._add_raw_sparse_probabilistic(raw_value)
+        else:
+            self._initialize_storage(HLLType.FULL)
+            self._add_raw_probabilistic(raw_value)
+
+    def _add_raw_explicit(self, raw_value):
+        """
+        ``add_raw()`` for a ``HLLType.EXPLICIT`` HLL, promoting it if necessary.
+
+        :param long raw_value: the value to be added
+        :rtype: void
+        """
+        explicit_storage = self._explicit_storage
+        size = len(explicit_storage)
+        explicit_storage.add(raw_value)
+
+        # promotion, if necessary (only when the value was not already present)
+        if len(explicit_storage) != size and size >= self._explicit_threshold:
+            if not self._sparse_off:
                 self._initialize_storage(HLLType.SPARSE)
-                self._add_raw_sparse_probabilistic(raw_value)
             else:
                 self._initialize_storage(HLLType.FULL)
-                self._add_raw_probabilistic(raw_value)
-            return
+            self._add_raw_probabilistic_batch(_to_uint64_array(list(explicit_storage)))
+            self._explicit_storage = None
 
-        elif self._type == HLLType.EXPLICIT:
-            self._explicit_storage.add(raw_value)
+    def _add_raw_sparse(self, raw_value):
+        """
+        ``add_raw()`` for a ``HLLType.SPARSE`` HLL, promoting it if necessary.
 
-            # promotion, if necessary
-            if len(self._explicit_storage) > self._explicit_threshold:
-                if not self._sparse_off:
-                    self._initialize_storage(HLLType.SPARSE)
-                    for value in self._explicit_storage:
-                        self._add_raw_sparse_probabilistic(value)
-                else:
-                    self._initialize_storage(HLLType.FULL)
-                    for value in self._explicit_storage:
-                        self._add_raw_probabilistic(value)
-                self._explicit_storage = None
-            return
+        :param long raw_value: the value to be added
+        :rtype: void
+        """
+        self._add_raw_sparse_probabilistic(raw_value)
 
-        elif self._type == HLLType.SPARSE:
-            self._add_raw_sparse_probabilistic(raw_value)
+        # promotion, if necessary
+        if len(self._sparse_probabilistic_storage) > self._sparse_threshold:
+            self._initialize_storage(HLLType.FULL)
+            self._merge_sparse_registers(self._sparse_probabilistic_storage)
+            self._sparse_probabilistic_storage = None
+            self._indicator_sum = None
 
-            # promotion, if necessary
-            if len(self._sparse_probabilistic_storage) > self._sparse_threshold:
-                self._initialize_storage(HLLType.FULL)
-                for register_index in self._sparse_probabilistic_storage.keys():
-                    register_value = self._sparse_probabilistic_storage.get(register_index, 0)
-                    self._probabilistic_storage.set_max_register(register_index, register_value)
-                self._sparse_probabilistic_storage = None
+    # arrays shorter than this are added one element at a time with ``add_raw()``
+    BATCH_THRESHOLD = 64
+
+    def add_raw_batch(self, raw_values):
+        """
+        Adds many raw values directly to the HLL. The result is identical to
+        calling ``add_raw()`` for each value, but the register updates of the
+        ``HLLType.SPARSE`` and ``HLLType.FULL`` representations are computed
+        for the whole array at once with NumPy.
+
+        :param raw_values: the values to be added, already hashed (see ``add_raw()``).
+               Signed values are interpreted as their two's complement ``long`` bits.
+        :type raw_values: numpy.ndarray or list
+        :rtype: void
+        """
+        self._cached_bytes = None
+        raw_values = _to_uint64_array(raw_values)
+        if len(raw_values) < HLL.BATCH_THRESHOLD:
+            for value in raw_values.view(np.int64).tolist():
+                self.add_raw(value)
             return
 
+        # EMPTY and EXPLICIT keep the exact values, so add them one by one
+        # until the HLL has been promoted to a probabilistic type
+        if self._type in (HLLType.EMPTY, HLLType.EXPLICIT):
+            signed_values = raw_values.view(np.int64).tolist()
+            for i, value in enumerate(signed_values):
+                self.add_raw(value)
+                if self._type not in (HLLType.EMPTY, HLLType.EXPLICIT):
+                    raw_values = raw_values[i + 1:]
+                    break
+            else:
+                return
+
+        self._add_raw_probabilistic_batch(raw_values)
+
+        # promotion, if necessary
+        if self._type == HLLType.SPARSE and len(self._sparse_probabilistic_storage) > self._sparse_threshold:
+            self._initialize_storage(HLLType.FULL)
+            self._merge_sparse_registers(self._sparse_probabilistic_storage)
+            self._sparse_probabilistic_storage = None
+            self._indicator_sum = None
+
+    def _add_raw_probabilistic_batch(self, raw_values):
+        """
+        Adds the raw values to the ``sparseProbabilisticStorage`` or the
+        ``probabilisticStorage``, without promotion. ``type`` must be
+        ``HLLType.SPARSE`` or ``HLLType.FULL``.
+
+        :param numpy.ndarray raw_values: the raw values as ``numpy.uint64``
+        :rtype: void
+        """
+        if self._type == HLLType.SPARSE:
+            register_indices, register_values = self._batch_register_updates(raw_values)
+            storage = self._sparse_probabilistic_storage
+            if not storage:
+                # e.g. right after promotion from EXPLICIT: the indices are
+                # distinct, so the map is filled in one bulk update
+                storage.update(zip(register_indices.tolist(), register_values.tolist()))
+            else:
+                for register_index, register_value in zip(register_indices.tolist(), register_values.tolist()):
+                    if register_value > storage[register_index]:
+                        storage[register_index] = register_value
+
         elif self._type == HLLType.FULL:
-            self._add_raw_probabilistic(raw_value)
-            return
+            # NOTE:  np.maximum.at() folds repeated indices itself, so there
+            #        is no need to sort them out first
+            register_indices, register_values = self._batch_register_updates(raw_values, distinct=False)
+            self._probabilistic_storage.merge_max_sparse(register_indices, register_values.astype(np.uint8))
 
         else:
             raise Exception("Unsupported HLL type: {}".format(self._type))
 
+        # the registers were updated in bulk
+        self._indicator_sum = None
+
+    def _batch_register_updates(self, raw_values, distinct=True):
+        """
+        Computes the vectorized equivalent of the register index ``j`` and
+        ``p(w)`` of ``_add_raw_probabilistic()`` for an array of raw values.
+
+        :param numpy.ndarray raw_values: the raw values as ``numpy.uint64``
+        :param boolean distinct: flag indicating if the register indices should
+               be made distinct. If not, there is one index and ``p(w)`` per raw
+               value with a non-zero ``p(w)``, in no particular order.
+        :returns: the register indices touched by ``raw_values`` and the
+                  largest non-zero ``p(w)`` seen for each of them
+        :rtype: tuple
+        """
+        sub_stream_values = raw_values >> np.uint64(self._log2m)
+        # See _add_raw_probabilistic() for why p(0x0) is 0 and zeroes are skipped.
+        keep = sub_stream_values != 0
+        if not keep.all():
+            raw_values = raw_values[keep]
+            sub_stream_values = sub_stream_values[keep]
+
+        # isolate the least significant set bit, x & (~x + 1), reusing buffers
+        masked = np.bitwise_or(sub_stream_values, np.uint64(self._pw_max_mask & LONG_MASK), out=sub_stream_values)
+        lowest_bit = np.invert(masked)
+        lowest_bit += np.uint64(1)
+        lowest_bit &= masked
+        # as it is a power of two frexp() yields its exponent exactly, i.e.
+        # lsb(masked) + 1 = p(w)
+        _, p_w = np.frexp(lowest_bit.astype(np.float64))
+        j = (raw_values & np.uint64(self._m_bits_mask)).astype(np.int64)
+        if not distinct:
+            return j, p_w
+
+        register_indices, inverse = np.unique(j, return_inverse=True)
+        register_values = np.zeros(len(register_indices), dtype=np.int64)
+        np.maximum.at(register_values, inverse, p_w)
+        return register_indices, register_values
+
     def _add_raw_sparse_probabilistic(self, raw_value):
         """
         Adds the raw value to the ``sparseProbabilisticStorage``.
@@ -295,7 +458,7 @@ class HLL:
         #      lsb(pw_max_mask) = 2^(register_value_in_bits) - 2,
         # thus lsb(any_long | pw_max_mask) <= 2^(register_value_in_bits) - 2,
         # thus 1 + lsb(any_long | pw_max_mask) <= 2^(register_value_in_bits) -1.
-        sub_stream_value = BitUtil.unsigned_right_shift_long(raw_value, self._log2m)
+        sub_stream_value = (int(raw_value) & LONG_MASK) >> self._log2m  # unsigned (Java >>>)
         p_w = None
 
         if sub_stream_value == 0:
@@ -305,7 +468,11 @@ class HLL:
             # because the probability is 1/(2^(2^register_size_in_bits)).
             p_w = 0
         else:
-            p_w = BitUtil.to_signed_byte(1 + BitUtil.least_significant_bit(sub_stream_value | self._pw_max_mask))
+            # NOTE:  (x & -x) isolates the least significant set bit, so its
+            #        bit length is 1 + lsb(x). By the contract above this is
+            #        always a (positive) register value, no byte conversion needed.
+            masked = sub_stream_value | self._pw_max_mask
+            p_w = (masked & -masked).bit_length()
 
         # Short-circuit if the register is being set to zero, since algorithmically
         # this corresponds to an "unset" register, and "unset" registers aren't
@@ -318,9 +485,17 @@ class HLL:
         # NOTE:  no +1 as in paper since 0-based indexing
         j = int(raw_value & self._m_bits_mask)
 
-        current_value = self._sparse_probabilistic_storage.get(j, 0)
+        # NOTE:  a missing register is inserted as zero by the lookup, but as
+        #        p_w is non-zero it is always overwritten right after
+        #        (see _initialize_storage())
+        storage = self._sparse_probabilistic_storage
+        current_value = storage[j]
         if p_w > current_value:
-            self._sparse_probabilistic_storage[j] = p_w
+            storage[j] = p_w
+            if self._indicator_sum is not None:
+                self._indicator_sum += (1 << (self._value_mask - p_w)) - (1 << (self._value_mask - current_value))
+                if current_value == 0:
+                    self._number_of_zeroes -= 1
 
     def _add_raw_probabilistic(self, raw_value):
         """
@@ -337,7 +512,7 @@ class HLL:
         #      lsb(pw_max_mask) = 2^(register_value_in_bits) - 2,
         # thus lsb(any_long | pw_max_mask) <= 2^(register_value_in_bits) - 2,
         # thus 1 + lsb(any_long | pw_max_mask) <= 2^(register_value_in_bits) -1.
-        sub_stream_value = BitUtil.unsigned_right_shift_long(raw_value, self._log2m)
+        sub_stream_value = (int(raw_value) & LONG_MASK) >> self._log2m  # unsigned (Java >>>)
         p_w = None
 
         if sub_stream_value == 0:
@@ -347,7 +522,11 @@ class HLL:
             # because the probability is 1/(2^(2^register_size_in_bits)).
             p_w = 0
         else:
-            p_w = BitUtil.to_signed_byte(1 + BitUtil.least_significant_bit(sub_stream_value | self._pw_max_mask))
+            # NOTE:  (x & -x) isolates the least significant set bit, so its
+            #        bit length is 1 + lsb(x). By the contract above this is
+            #        always a (positive) register value, no byte conversion needed.
+            masked = sub_stream_value | self._pw_max_mask
+            p_w = (masked & -masked).bit_length()
 
         # Short-circuit if the register is being set to zero, since algorithmically
         # this corresponds to an "unset" register, and "unset" registers aren't
@@ -360,7 +539,35 @@ class HLL:
         # NOTE:  no +1 as in paper since 0-based indexing
         j = int(raw_value & self._m_bits_mask)
 
-        self._probabilistic_storage.set_max_register(j, p_w)
+        registers = self._probabilistic_storage.as_uint8_array()
+        current_value = int(registers[j])
+        if p_w > current_value:
+            registers[j] = p_w
+            if self._indicator_sum is not None:
+                self._indicator_sum += (1 << (self._value_mask - p_w)) - (1 << (self._value_mask - current_value))
+                if current_value == 0:
+                    self._number_of_zeroes -= 1
+
+    def _set_type(self, type):
+        """
+        Changes the instance's ``type`` along with the ``add_raw()``
+        implementation used for that type. Storage is left untouched.
+
+        :param HLLType type: the new ``HLLType``. This cannot be ``None`` and
+               must be an instantiable type.
+        :rtype: void
+        """
+        if type == HLLType.EMPTY:
+            self._add_impl = self._add_raw_empty
+        elif type == HLLType.EXPLICIT:
+            self._add_impl = self._add_raw_explicit
+        elif type == HLLType.SPARSE:
+            self._add_impl = self._add_raw_sparse
+        elif type == HLLType.FULL:
+            self._add_impl = self._add_raw_probabilistic
+        else:
+            raise Exception("Unsupported HLL type: {}".format(type))
+        self._type = type
 
     def _initialize_storage(self, type):
         """
@@ -372,19 +579,53 @@ class HLL:
                it cannot be ``HLLType.UNDEFINED``.)
         :rtype: void
         """
-        self._type = type
+        self._set_type(type)
         if type == HLLType.EMPTY:
             # nothing to be done
             pass
         elif type == HLLType.EXPLICIT:
             self._explicit_storage = set()
         elif type == HLLType.SPARSE:
-            self._sparse_probabilistic_storage = dict()
+            # NOTE:  a missing register reads as zero. Only non-zero registers
+            #        may be stored, so lookups with [] must always be followed
+            #        by storing a non-zero value.
+            self._sparse_probabilistic_storage = defaultdict(int)
+            self._reset_indicator()
         elif type == HLLType.FULL:
             self._probabilistic_storage = BitVector(self._regwidth, self._m)
+            self._reset_indicator()
         else:
             raise Exception("Unsupported HLL type: {}".format(self._type))
 
+    def _reset_indicator(self):
+        """
+        Sets ``_indicator_sum`` and ``_number_of_zeroes`` to those of all
+        registers being zero.
+
+        :rtype: void
+        """
+        self._indicator_sum = self._m << self._value_mask
+        self._number_of_zeroes = self._m
+
+    def _compute_indicator(self):
+        """
+        Recomputes ``_indicator_sum`` and ``_number_of_zeroes`` from the
+        registers. ``type`` must be ``HLLType.SPARSE`` or ``HLLType.FULL``.
+
+        :rtype: void
+        """
+        if self._type == HLLType.SPARSE:
+            values = self._sparse_probabilistic_storage.values()
+            counts = np.bincount(np.fromiter(values, dtype=np.int64, count=len(values)), minlength=1)
+            counts[0] = self._m - len(values)  # unset registers are zero
+        else:
+            counts = np.bincount(self._probabilistic_storage.as_uint8_array(), minlength=1)
+
+        self._number_of_zeroes = int(counts[0])
+        self._indicator_sum = 0
+        for register, count in enumerate(counts.tolist()):
+            self._indicator_sum += count << (self._value_mask - register)
+
     def cardinality(self):
         """
         Computes the cardinality of the HLL.
@@ -403,6 +644,19 @@ class HLL:
         else:
             raise Exception("Unsupported HLL type: {}".format(self._type))
 
+    def _merge_sparse_registers(self, sparse_probabilistic_storage):
+        """
+        Sets each register of the ``probabilisticStorage`` to the maximum of
+        its value and that of the register in ``sparse_probabilistic_storage``.
+        ``type`` must be ``HLLType.FULL``.
+
+        :param dict sparse_probabilistic_storage: the SPARSE registers to merge
+        :rtype: void
+        """
+        # NOTE:  the indices of SPARSE registers never repeat
+        register_indices, register_values = _sparse_register_arrays(sparse_probabilistic_storage)
+        self._probabilistic_storage.merge_max_sparse(register_indices, register_values, distinct=True)
+
     def _sparse_probabilistic_algorithm_cardinality(self):
         """
         Computes the exact cardinality value returned by the HLL algorithm when
@@ -413,28 +667,23 @@ class HLL:
         :returns: the exact, unrounded cardinality given by the HLL algorithm
         :rtype: float
         """
-        from python_hll.hllutil import HLLUtil
         m = self._m
 
-        # compute the "indicator function" -- sum(2^(-M[j])) where M[j] is the
-        # 'j'th register value
-        indicator_function = 0.0
-        number_of_zeroes = 0  # "V" in the paper
-        for j in range(m):
-            register = self._sparse_probabilistic_storage.get(j, 0)
-
-            indicator_function += 1.0 / BitUtil.left_shift_long(1, register)
-            if register == 0:
-                number_of_zeroes += 1
+        # the "indicator function" -- sum(2^(-M[j])) where M[j] is the
+        # 'j'th register value -- is maintained as registers change
+        if self._indicator_sum is None:
+            self._compute_indicator()
+        indicator_function = self._indicator_sum / (1 << self._value_mask)
+        number_of_zeroes = self._number_of_zeroes  # "V" in the paper
 
         # apply the estimate and correction to the indicator function
         estimator = self._alpha_m_squared / indicator_function
         if number_of_zeroes != 0 and estimator < self._small_estimator_cutoff:
-            return HLLUtil.small_estimator(m, number_of_zeroes)
+            return hllutil.HLLUtil.small_estimator(m, number_of_zeroes)
         elif estimator <= self._large_estimator_cutoff:
             return estimator
         else:
-            return HLLUtil.large_estimator(self._log2m, self._regwidth, estimator)
+            return hllutil.HLLUtil.large_estimator(self._log2m, self._regwidth, estimator)
 
     def _full_probabilistic_algorithm_cardinality(self):
         """
@@ -444,26 +693,22 @@ class HLL:
 
         :rtype: float
         """
-        from python_hll.hllutil import HLLUtil
         # for performance
         m = self._m
-        # compute the "indicator function" -- sum(2^(-M[j])) where M[j] is the
-        # 'j'th register value
-        sum = 0
-        number_of_zeroes = 0  # "V" in the paper
-        iterator = self._probabilistic_storage.register_iterator()
-        for register in iterator:
-            sum += 1.0 / BitUtil.left_shift_long(1, register)
-            if register == 0:
-                number_of_zeroes += 1
+        # the "indicator function" -- sum(2^(-M[j])) where M[j] is the
+        # 'j'th register value -- is maintained as registers change
+        if self._indicator_sum is None:
+            self._compute_indicator()
+        sum = self._indicator_sum / (1 << self._value_mask)
+        number_of_zeroes = self._number_of_zeroes  # "V" in the paper
         # apply the estimate and correction to the indicator function
         estimator = self._alpha_m_squared / sum
         if number_of_zeroes != 0 and (estimator < self._small_estimator_cutoff):
-            return HLLUtil.small_estimator(m, number_of_zeroes)
+            return hllutil.HLLUtil.small_estimator(m, number_of_zeroes)
         elif estimator <= self._large_estimator_cutoff:
             return estimator
         else:
-            return HLLUtil.large_estimator(self._log2m, self._regwidth, estimator)
+            return hllutil.HLLUtil.large_estimator(self._log2m, self._regwidth, estimator)
 
     def clear(self):
         """
@@ -476,18 +721,62 @@ class HLL:
 
         :rtype: void
         """
+        self._cached_bytes = None
         if self._type == HLLType.EMPTY:
             return  # do nothing
         elif self._type == HLLType.EXPLICIT:
             return self._explicit_storage.clear()
         elif self._type == HLLType.SPARSE:
+            self._reset_indicator()
             return self._sparse_probabilistic_storage.clear()
         elif self._type == HLLType.FULL:
             self._probabilistic_storage.fill(0)
+            self._reset_indicator()
             return
         else:
             raise Exception('Unsupported HLL type: {}'.format(self._type))
 
+    def __getstate__(self):
+        """
+        Pickles the members held in ``__slots__``, which has no default
+        support below pickle protocol 2. The ``add_raw()`` implementation is
+        bound to this instance so it is left out (see ``__setstate__()``).
+
+        :rtype: dict
+        """
+        return dict((name, getattr(self, name)) for name in HLL.__slots__ if name != '_add_impl' and hasattr(self, name))
+
+    def __setstate__(self, state):
+        """
+        :param dict state: the members returned by ``__getstate__()``.
+        :rtype: void
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._set_type(self._type)
+
+    def clone(self):
+        """
+        Copies the HLL without going through ``copy.deepcopy()``. Only the
+        storage of the current type is copied; everything else is immutable.
+
+        :returns: a copy of this HLL that shares no storage with it.
+        :rtype: HLL
+        """
+        clone = HLL.__new__(HLL)
+        for name in HLL.__slots__:
+            if hasattr(self, name):
+                setattr(clone, name, getattr(self, name))
+        # the add_raw() implementation is bound to this instance
+        clone._set_type(self._type)
+        if self._type == HLLType.EXPLICIT:
+            clone._explicit_storage = self._explicit_storage.copy()
+        elif self._type == HLLType.SPARSE:
+            clone._sparse_probabilistic_storage = self._sparse_probabilistic_storage.copy()
+        elif self._type == HLLType.FULL:
+            clone._probabilistic_storage = self._probabilistic_storage.clone()
+        return clone
+
     def union(self, other):
         """
         Computes the union of HLLs and stores the result in this instance.
@@ -497,51 +786,52 @@ class HLL:
         :rtype: void
         """
         # TODO: verify HLL compatibility
-        other_type = other.get_type()
+        union_impl = HLL._UNION_IMPLS.get((self._type, other.get_type()))
+        if union_impl is None:
+            raise Exception('Unsupported HLL type: {}'.format(self._type))
+        union_impl(self, other)
 
-        if self._type == other_type:
-            self._homogeneous_union(other)
-        else:
-            self._heterogenous_union(other)
+        # the registers may have been merged in bulk
+        self._indicator_sum = None
+        self._cached_bytes = None
 
     def _heterogeneous_union_for_empty_hll(self, other):
         # The union of empty with non-empty HLL is just a clone of the non-empty.
+        # NOTE:  shallow copies of the storage suffice (here and below) since
+        #        the values and registers stored are immutable ints.
 
         if other.get_type() == HLLType.EXPLICIT:
             # src: EXPLICIT
             # dest: EMPTY
 
             if len(other._explicit_storage) <= self._explicit_threshold:
-                self._type = HLLType.EXPLICIT
-                self._explicit_storage = deepcopy(other._explicit_storage)
+                self._set_type(HLLType.EXPLICIT)
+                self._explicit_storage = other._explicit_storage.copy()
             else:
                 if not self._sparse_off:
                     self._initialize_storage(HLLType.SPARSE)
                 else:
                     self._initialize_storage(HLLType.FULL)
 
-                for value in other._explicit_storage:
-                    self.add_raw(value)
+                self.add_raw_batch(list(other._explicit_storage))
 
         elif other.get_type() == HLLType.SPARSE:
             # src: SPARSE
             # dest: EMPTY
 
             if not self._sparse_off:
-                self._type = HLLType.SPARSE
-                self._sparse_probabilistic_storage = deepcopy(other._sparse_probabilistic_storage)
+                self._set_type(HLLType.SPARSE)
+                self._sparse_probabilistic_storage = other._sparse_probabilistic_storage.copy()
             else:
                 self._initialize_storage(HLLType.FULL)
-                for register_index in other._sparse_probabilistic_storage.keys():
-                    register_value = other._sparse_probabilistic_storage.get(register_index)
-                    self._probabilistic_storage.set_max_register(register_index, register_value)
+                self._merge_sparse_registers(other._sparse_probabilistic_storage)
             return
 
         else:  # case FULL
             # src: FULL
             # dest: EMPTY
-            self._type = HLLType.FULL
-            self._probabilistic_storage = deepcopy(other._probabilistic_storage)
+            self._set_type(HLLType.FULL)
+            self._probabilistic_storage = other._probabilistic_storage.clone()
             return
 
     def _heterogeneous_union_for_non_empty_hll(self, other):
@@ -559,20 +849,19 @@ class HLL:
 
             if other.get_type() == HLLType.SPARSE:
                 if not self._sparse_off:
-                    self._type = HLLType.SPARSE
-                    self._sparse_probabilistic_storage = deepcopy(other._sparse_probabilistic_storage)
+                    self._set_type(HLLType.SPARSE)
+                    self._sparse_probabilistic_storage = other._sparse_probabilistic_storage.copy()
                 else:
                     self._initialize_storage(HLLType.FULL)
-                    for register_index in other._sparse_probabilistic_storage.keys():
-                        register_value = other._sparse_probabilistic_storage.get(register_index)
-                        self._probabilistic_storage.set_max_register(register_index, register_value)
+                    self._merge_sparse_registers(other._sparse_probabilistic_storage)
 
             else:  # source is HLLType.FULL
-                self._type = HLLType.FULL
-                self._probabilistic_storage = deepcopy(other._probabilistic_storage)
+                self._set_type(HLLType.FULL)
+                self._probabilistic_storage = other._probabilistic_storage.clone()
 
-            for value in self._explicit_storage:
-                self.add_raw(value)
+            # NOTE:  the destination is now SPARSE or FULL, so the values can
+            #        be added in bulk
+            self.add_raw_batch(list(self._explicit_storage))
             self._explicit_storage = None
             return
 
@@ -582,9 +871,8 @@ class HLL:
                 # dest: SPARSE
                 # Add the raw values from the source to the destination.
 
-                for value in other._explicit_storage:
-                    # NOTE: add_raw will handle promotion cleanup
-                    self.add_raw(value)
+                # NOTE: add_raw_batch will handle promotion cleanup
+                self.add_raw_batch(list(other._explicit_storage))
 
             else:  # source is HLLType.FULL
                 # src:  FULL
@@ -594,11 +882,9 @@ class HLL:
                 # clone of source is made and registers from the destination
                 # are merged into the clone.
 
-                self._type = HLLType.FULL
-                self._probabilistic_storage = deepcopy(other._probabilistic_storage)
-                for register_index in self._sparse_probabilistic_storage.keys():
-                    register_value = self._sparse_probabilistic_storage.get(register_index, 0)
-                    self._probabilistic_storage.set_max_register(register_index, register_value)
+                register_indices, register_values = _sparse_register_arrays(self._sparse_probabilistic_storage)
+                self._set_type(HLLType.FULL)
+                self._probabilistic_storage = other._probabilistic_storage.clone_and_merge_sparse(register_indices, register_values)
                 self._sparse_probabilistic_storage = None
 
         else:  # destination is HLLType.FULL
@@ -608,8 +894,7 @@ class HLL:
                 # Add the raw values from the source to the destination.
                 # Promotion is not possible, so don't bother checking.
 
-                for value in other._explicit_storage:
-                    self.add_raw(value)
+                self.add_raw_batch(list(other._explicit_storage))
 
             else:  # source is HLLType.SPARSE
                 # src: SPARSE
@@ -617,78 +902,97 @@ class HLL:
                 # Merge the registers from the source into the destination.
                 # Promotion is not possible, so don't bother checking.
 
-                for register_index in other._sparse_probabilistic_storage.keys():
-                    register_value = other._sparse_probabilistic_storage.get(register_index)
-                    self._probabilistic_storage.set_max_register(register_index, register_value)
+                self._merge_sparse_registers(other._sparse_probabilistic_storage)
 
-    def _heterogenous_union(self, other):
+    def _union_nothing(self, other):
         """
-        The logic here is divided into two sections: unions with an EMPTY
-        HLL, and unions between EXPLICIT/SPARSE/FULL HLL.
+        The union of any HLL with an EMPTY source, which leaves this instance
+        unchanged.
 
-        Between those two sections, all possible heterogeneous unions are
-        covered. Should another type be added to HLLType whose unions
-        are not easily reduced (say, as EMPTY's are below) this may be more
-        easily implemented as Strategies. However, that is unnecessary as it
-        stands.
-        :type other: HLL
+        :param HLL other: the ``HLLType.EMPTY`` HLL to union into this one.
         :rtype: void
         """
+        pass
 
-        # Union with an EMPTY
-        if self._type == HLLType.EMPTY:
-            self._heterogeneous_union_for_empty_hll(other)
-            return
-        elif other.get_type() == HLLType.EMPTY:
-            # source is empty, so just return destination since it is unchanged
-            return
-
-        # else -- both of the sets are not empty
-        self._heterogeneous_union_for_non_empty_hll(other)
-
-    def _homogeneous_union(self, other):
+    def _union_explicit(self, other):
         """
-        Computes the union of two HLLs of the same type, and stores the
+        Computes the union of two ``HLLType.EXPLICIT`` HLLs, and stores the
         result in this instance.
 
         :param HLL other: the other ``HLL`` instance to union into this one. This
                cannot be ``None``.
         :rtype: void
         """
-        if self._type == HLLType.EMPTY:
-            # union of empty and empty is empty
-            return
-
-        elif self._type == HLLType.EXPLICIT:
-            for value in other._explicit_storage:
-                # Note: add_raw() will handle promotion, if necessary
-                self.add_raw(value)
-
-        elif self._type == HLLType.SPARSE:
-
-            for register_index in other._sparse_probabilistic_storage.keys():
-                register_value = other._sparse_probabilistic_storage.get(register_index)
-                current_register_value = self._sparse_probabilistic_storage.get(register_index, 0)
-                if register_value > current_register_value:
-                    self._sparse_probabilistic_storage[register_index] = register_value
+        self._explicit_storage |= other._explicit_storage
 
-            # promotion, if necessary
-            if len(self._sparse_probabilistic_storage) > self._sparse_threshold:
+        # promotion, if necessary
+        if len(self._explicit_storage) > self._explicit_threshold:
+            values = list(self._explicit_storage)
+            if not self._sparse_off:
+                self._initialize_storage(HLLType.SPARSE)
+            else:
                 self._initialize_storage(HLLType.FULL)
-                for register_index in self._sparse_probabilistic_storage.keys():
-                    register_value = self._sparse_probabilistic_storage.get(register_index, 0)
-                    self._probabilistic_storage.set_max_register(register_index, register_value)
+            self._explicit_storage = None
 
-                self._sparse_probabilistic_storage = None
+            # NOTE: add_raw_batch will handle promotion to FULL
+            self.add_raw_batch(values)
 
-        elif self._type == HLLType.FULL:
-            for i in range(self._m):
-                register_value = other._probabilistic_storage.get_register(i)
-                self._probabilistic_storage.set_max_register(i, register_value)
-            return
+    def _union_sparse(self, other):
+        """
+        Computes the union of two ``HLLType.SPARSE`` HLLs, and stores the
+        result in this instance.
 
-        else:
-            raise Exception('Unsupported HLL type: {}'.format(self._type))
+        :param HLL other: the other ``HLL`` instance to union into this one. This
+               cannot be ``None``.
+        :rtype: void
+        """
+        # NOTE:  get() rather than [], as a missing register would first be
+        #        stored as zero by the defaultdict and then overwritten
+        storage = self._sparse_probabilistic_storage
+        get_register = storage.get
+        for register_index, register_value in other._sparse_probabilistic_storage.items():
+            if register_value > get_register(register_index, 0):
+                storage[register_index] = register_value
+
+        # promotion, if necessary
+        if len(self._sparse_probabilistic_storage) > self._sparse_threshold:
+            self._initialize_storage(HLLType.FULL)
+            self._merge_sparse_registers(self._sparse_probabilistic_storage)
+
+            self._sparse_probabilistic_storage = None
+
+    def _union_full(self, other):
+        """
+        Computes the union of two ``HLLType.FULL`` HLLs, and stores the
+        result in this instance.
+
+        :param HLL other: the other ``HLL`` instance to union into this one. This
+               cannot be ``None``.
+        :rtype: void
+        """
+        self._probabilistic_storage.merge_max(other._probabilistic_storage)
+
+    # ``union()`` implementations by (destination type, source type). Unions
+    # with an EMPTY destination clone the source, and the remaining
+    # heterogeneous unions are those between EXPLICIT/SPARSE/FULL HLLs.
+    _UNION_IMPLS = {
+        (HLLType.EMPTY, HLLType.EMPTY): _union_nothing,
+        (HLLType.EMPTY, HLLType.EXPLICIT): _heterogeneous_union_for_empty_hll,
+        (HLLType.EMPTY, HLLType.SPARSE): _heterogeneous_union_for_empty_hll,
+        (HLLType.EMPTY, HLLType.FULL): _heterogeneous_union_for_empty_hll,
+        (HLLType.EXPLICIT, HLLType.EMPTY): _union_nothing,
+        (HLLType.EXPLICIT, HLLType.EXPLICIT): _union_explicit,
+        (HLLType.EXPLICIT, HLLType.SPARSE): _heterogeneous_union_for_non_empty_hll,
+        (HLLType.EXPLICIT, HLLType.FULL): _heterogeneous_union_for_non_empty_hll,
+        (HLLType.SPARSE, HLLType.EMPTY): _union_nothing,
+        (HLLType.SPARSE, HLLType.EXPLICIT): _heterogeneous_union_for_non_empty_hll,
+        (HLLType.SPARSE, HLLType.SPARSE): _union_sparse,
+        (HLLType.SPARSE, HLLType.FULL): _heterogeneous_union_for_non_empty_hll,
+        (HLLType.FULL, HLLType.EMPTY): _union_nothing,
+        (HLLType.FULL, HLLType.EXPLICIT): _heterogeneous_union_for_non_empty_hll,
+        (HLLType.FULL, HLLType.SPARSE): _heterogeneous_union_for_non_empty_hll,
+        (HLLType.FULL, HLLType.FULL): _union_full,
+    }
 
     def to_bytes(self, schema_version=SerializationUtil.DEFAULT_SCHEMA_VERSION):
         """
@@ -698,24 +1002,26 @@ class HLL:
         :param SchemaVersion schema_version: the schema version dictating the serialization format
         :returns: the array of bytes representing the HLL. This will never be
                   ``None`` or empty.
-        :rtype: list
+        :rtype: bytearray
         """
-        from python_hll.hllutil import HLLUtil
+        # unchanged since last serialized, see _cached_bytes
+        if self._cached_bytes is not None and self._cached_schema_version is schema_version:
+            return bytearray(self._cached_bytes)
+
         if self._type == HLLType.EMPTY:
             byte_array_length = schema_version.padding_bytes(self._type)
-            byte_array = [0] * byte_array_length
+            byte_array = bytearray(byte_array_length)
 
         elif self._type == HLLType.EXPLICIT:
             serializer = schema_version.get_serializer(
                 self._type,
-                HLLUtil.LONG_BIT_LENGTH,
+                hllutil.HLLUtil.LONG_BIT_LENGTH,
                 len(self._explicit_storage)
             )
 
-            values = list(self._explicit_storage)
-            values = sorted(values)
-            for value in values:
-                serializer.write_word(value)
+            values = np.fromiter(self._explicit_storage, dtype=np.int64, count=len(self._explicit_storage))
+            values.sort()
+            serializer.write_words(values)
 
             byte_array = serializer.get_bytes()
 
@@ -726,15 +1032,12 @@ class HLL:
                 len(self._sparse_probabilistic_storage)
             )
 
-            indices = self._sparse_probabilistic_storage.keys()
-            indices = sorted(indices)
-
-            for register_index in indices:
-                register_value = self._sparse_probabilistic_storage.get(register_index, 0)
+            register_indices, register_values = _sparse_register_arrays(self._sparse_probabilistic_storage)
+            order = np.argsort(register_indices)
 
-                # pack index and value into "short word"
-                short_word = BitUtil.left_shift_int(register_index, self._regwidth) | register_value
-                serializer.write_word(short_word)
+            # pack index and value into "short word"
+            short_words = (register_indices[order] << self._regwidth) | register_values[order].astype(np.int64)
+            serializer.write_words(short_words)
 
             byte_array = serializer.get_bytes()
 
@@ -747,24 +1050,22 @@ class HLL:
         else:
             raise Exception('Unsupported HLL type: {}'.format(self._type))
 
-        # no use of it if any _explicit_off or _explicit_auto is true
-        log2_explicit_threshold = 0
-        if not self._explicit_auto | self._explicit_off:
-            log2_explicit_threshold = int(NumberUtil.log2(self._explicit_threshold))
-
         metadata = HLLMetadata(
             schema_version.schema_version_number(),
             self._type,
             self._log2m,
             self._regwidth,
-            log2_explicit_threshold,
+            self._log2_explicit_threshold,
             self._explicit_off,
             self._explicit_auto,
             not self._sparse_off
         )
         schema_version.write_metadata(byte_array, metadata)
 
-        return byte_array
+        # NOTE:  a copy is returned so that callers cannot change the cache
+        self._cached_bytes = byte_array
+        self._cached_schema_version = schema_version
+        return bytearray(byte_array)
 
     @classmethod
     def from_bytes(cls, bytes):
@@ -772,11 +1073,12 @@ class HLL:
         Deserializes the HLL (in ``toBytes()`` format) serialized
         into ``bytes``.
 
-        :param list bytes: the serialized bytes of new HLL
+        :param bytes: the serialized bytes of new HLL (a list of Java's signed
+               bytes is also accepted)
+        :type bytes: bytearray or bytes
         :returns: the deserialized HLL. This will never be ``None``.
         :rtype: HLL
         """
-        from python_hll.hllutil import HLLUtil
         schema_version = SerializationUtil.get_schema_version(bytes)
         metadata = schema_version.read_metadata(bytes)
 
@@ -803,7 +1105,7 @@ class HLL:
 
         word_length = 0
         if type == HLLType.EXPLICIT:
-            word_length = HLLUtil.LONG_BIT_LENGTH  # 64 for both java and python
+            word_length = hllutil.HLLUtil.LONG_BIT_LENGTH  # 64 for both java and python
 
         elif type == HLLType.SPARSE:
             word_length = hll._short_word_length
@@ -820,8 +1122,8 @@ class HLL:
             #        be exactly the number of words that were encoded,
             #        because the word length is at least a byte wide.
             # SEE:   BigEndianAscendingWordDeserializer.total_word_count()
-            for i in range(deserializer.total_word_count()):
-                hll._explicit_storage.add(deserializer.read_word())
+            words = deserializer.read_words(deserializer.total_word_count())
+            hll._explicit_storage.update(words.view(np.int64).tolist())
 
         elif type == HLLType.SPARSE:
             # NOTE:  If the short_word_length were smaller than 8 bits
@@ -830,14 +1132,15 @@ class HLL:
             #        registers read. However, this is not relevant as the
             #        extra registers will be all zeroes, which are ignored
             #        in the sparse representation.
-            for i in range(deserializer.total_word_count()):
-                short_word = deserializer.read_word()
+            short_words = deserializer.read_words(deserializer.total_word_count())
+
+            # NOTE:  registers are kept unsigned, as in FULL storage
+            register_values = short_words & np.uint64(hll._value_mask)
+            register_keys = short_words >> np.uint64(hll._regwidth)
 
-                register_value = BitUtil.to_signed_byte(short_word & hll._value_mask)
-                # Only set non-zero registers.
-                if register_value != 0:
-                    register_key = int(BitUtil.unsigned_right_shift_long(short_word, hll._regwidth))
-                    hll._sparse_probabilistic_storage[register_key] = register_value
+            # Only set non-zero registers.
+            non_zero = register_values != 0
+            hll._sparse_probabilistic_storage.update(zip(register_keys[non_zero].tolist(), register_values[non_zero].tolist()))
 
         elif type == HLLType.FULL:
             # NOTE:  Iteration is done using m (register count) and NOT
@@ -846,10 +1149,50 @@ class HLL:
             #        may be larger than regwidth, causing an extra register
             #        to be read.
             # SEE: BigEndianAscendingWordDeserializer.total_word_count()
-            for i in range(hll._m):
-                hll._probabilistic_storage.set_register(i, deserializer.read_word())
+            hll._probabilistic_storage.set_register_contents(deserializer)
 
         else:
             raise Exception('Unsupported HLL type: {}'.format(type))
 
+        # the registers were set directly
+        hll._indicator_sum = None
+
         return hll
+
+
+def _to_uint64_array(values):
+    """
+    Converts ``values`` into a ``numpy.uint64`` array holding the 64 bits of
+    each value, so that negative (signed ``long``) values wrap the same way
+    they do in ``add_raw()``.
+
+    :param values: the values to convert
+    :type values: numpy.ndarray or list
+    :rtype: numpy.ndarray
+    """
+    array = np.asarray(values)
+    if array.dtype == np.uint64:
+        return array
+    if array.dtype.kind in 'iub':
+        return array.astype(np.int64).view(np.uint64)
+    # e.g. a mix of negative values and values larger than 2^63 - 1
+    return np.array([int(value) & LONG_MASK for value in values], dtype=np.uint64)
+
+
+def _sparse_register_arrays(sparse_probabilistic_storage):
+    """
+    Converts SPARSE storage into arrays of register indices and values.
+
+    :param dict sparse_probabilistic_storage: the SPARSE registers
+    :returns: the register indices (``numpy.int64``) and the register values
+              (``numpy.uint8``), in the same order
+    :rtype: tuple
+    """
+    register_count = len(sparse_probabilistic_storage)
+    register_indices = np.fromiter(sparse_probabilistic_storage.keys(), dtype=np.int64, count=register_count)
+    register_values = np.fromiter(sparse_probabilistic_storage.values(), dtype=np.uint8, count=register_count)
+    return register_indices, register_values
+
+
+# NOTE:  imported last and as a module, as ``hllutil`` itself imports ``HLL``
+from python_hll import hllutil  # noqa: E402
@@ -2,7 +2,6 @@
 from math import log
 from python_hll.hll import HLL
 from python_hll.util import NumberUtil
-from python_hll.util import BitUtil
 
 
 class HLLUtil:
@@ -65,7 +64,19 @@ class HLLUtil:
                   based on the value of ``registerCount``.
         :rtype: float
         """
+        alpha_m_squared = ALPHA_M_SQUARED.get(m)
+        if alpha_m_squared is not None:
+            return alpha_m_squared
+        return cls._compute_alpha_m_squared(m)
 
+    @classmethod
+    def _compute_alpha_m_squared(cls, m):
+        """
+        Computes ``alpha_m_squared()`` without the ``ALPHA_M_SQUARED`` table.
+
+        :param int m: this cannot be less than 16 (2:sup:`4`).
+        :rtype: float
+        """
         if m < 16:
             raise Exception("'m' cannot be less than 16 ({m} < 16).".format(m=m))
 
@@ -152,10 +163,12 @@ class HLLUtil:
         :rtype: float
         """
         two_to_l = TWO_TO_L[(cls.REG_WIDTH_INDEX_MULTIPLIER * register_size_in_bits) + log2m]
-        try:
-            return -1 * two_to_l * log(1.0 - (estimator/two_to_l))
-        except ValueError:
+        # NOTE:  log(1 - x) rather than log1p(-x) to match the Java implementation
+        #        bit for bit. Outside of its domain the correction is zero.
+        remainder = 1.0 - (estimator/two_to_l)
+        if remainder <= 0.0:
             return 0
+        return -1 * two_to_l * log(remainder)
 
 
 # Precomputed ``twoToL`` values indexed by a linear combination of
@@ -173,7 +186,7 @@ class HLLUtil:
 TWO_TO_L = [0.0] * (HLL.MAXIMUM_REGWIDTH_PARAM + 1) * (HLL.MAXIMUM_LOG2M_PARAM + 1)
 for reg_width in range(HLL.MINIMUM_REGWIDTH_PARAM, HLL.MAXIMUM_REGWIDTH_PARAM+1):
     for log2m in range(HLL.MINIMUM_LOG2M_PARAM, HLL.MAXIMUM_LOG2M_PARAM+1):
-        max_register_value = BitUtil.left_shift_int(1, reg_width) - 1
+        max_register_value = (1 << reg_width) - 1
 
         # Since 1 is added to p(w) in the insertion algorithm, only
         # (maxRegisterValue - 1) bits are inspected hence the hash
@@ -182,3 +195,10 @@ for reg_width in range(HLL.MINIMUM_REGWIDTH_PARAM, HLL.MAXIMUM_REGWIDTH_PARAM+1)
         total_bits = pw_bits + log2m
         two_to_l = 2**total_bits
         TWO_TO_L[(HLLUtil.REG_WIDTH_INDEX_MULTIPLIER * reg_width) + log2m] = two_to_l
+
+# Precomputed ``alpha_m_squared()`` values indexed by the register count ``m``,
+# for every ``log2m`` between the specified ``HLL.{MINIMUM,MAXIMUM}_LOG2M_PARAM``
+# constants.
+ALPHA_M_SQUARED = {}
+for log2m in range(HLL.MINIMUM_LOG2M_PARAM, HLL.MAXIMUM_LOG2M_PARAM+1):
+    ALPHA_M_SQUARED[1 << log2m] = HLLUtil._compute_alpha_m_squared(1 << log2m)
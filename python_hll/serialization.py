@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import division
+from binascii import hexlify, unhexlify
+import numpy as np
 from python_hll.hlltype import HLLType
-from python_hll.util import BitUtil
 
 
 class BigEndianAscendingWordDeserializer:
@@ -13,20 +14,26 @@ class BigEndianAscendingWordDeserializer:
     BITS_PER_BYTE = 8
 
     # long mask for the maximum value stored in a byte
-    BYTE_MASK = BitUtil.left_shift_long(1, BITS_PER_BYTE) - 1
+    BYTE_MASK = (1 << BITS_PER_BYTE) - 1
+
+    # The largest signed long.
+    MAX_LONG = (1 << 63) - 1
 
     # :var int word_length: The length in bits of the words to be read.
-    # :var list bytes: The byte array to which the words are serialized.
+    # :var bytearray bytes: The byte array to which the words are serialized.
     # :var int byte_padding: The number of leading padding bytes in 'bytes' to be ignored.
     # :var int word_count: The number of words that the byte array contains.
     # :var int current_word_index: The current read state.
+    # :var list phases: The first byte offset, end byte offset and right shift of each
+    #     word within a period of words that starts on a byte boundary.
 
     def __init__(self, word_length, byte_padding, bytes):
         """
         :param int word_length: the length in bits of the words to be deserialized. Must
             be less than or equal to 64 and greater than or equal to 1.
         :param int byte_padding: the number of leading bytes that pad the serialized words.
-        :param list bytes: the byte array containing the serialized words. Cannot be ``None``.
+        :param bytearray bytes: the byte array containing the serialized words. A list
+            of (signed or unsigned) bytes is also accepted. Cannot be ``None``.
         """
         if not 1 <= word_length <= 64:
             raise ValueError("Word length must be >= 1 and <= 64. (was: {word_length})".format(word_length=word_length))
@@ -34,17 +41,40 @@ class BigEndianAscendingWordDeserializer:
         if byte_padding < 0:
             raise ValueError("Byte padding must be >= zero. (was: {byte_padding})".format(byte_padding=byte_padding))
 
+        # Anything other than a byte buffer (e.g. a list of Java's signed bytes) is
+        # copied into a bytearray once, so that words can be read from slices of it.
+        if not isinstance(bytes, (bytearray, memoryview, type(b''))):
+            bytes = bytearray(byte & self.BYTE_MASK for byte in bytes)
+
         self._word_length = word_length
+        self._word_mask = (1 << word_length) - 1
         self._bytes = bytes
         self._byte_padding = byte_padding
 
+        # Words are read from slices of a view, which do not copy the bytes.
+        self._bytes_view = memoryview(bytes)
+
         self.data_bytes = (len(bytes) - byte_padding)
         self.data_bits = self.data_bytes * self.BITS_PER_BYTE
 
-        self.word_count = int(self.data_bits/self._word_length)
+        self.word_count = self.data_bits // self._word_length
 
         self.current_word_index = 0
 
+        # Word boundaries line up with byte boundaries again after a fixed number
+        # of words (the period), so the byte range of a word and the shift that
+        # right-aligns it only depend on its position within the period.
+        self._period_word_count = self.BITS_PER_BYTE // min(word_length & -word_length, self.BITS_PER_BYTE)
+        self._period_byte_count = (self._period_word_count * word_length) // self.BITS_PER_BYTE
+        self._byte_aligned = (word_length % self.BITS_PER_BYTE == 0)
+        self._phases = []
+        for phase in range(self._period_word_count):
+            first_bit_index = phase * word_length
+            last_bit_index = first_bit_index + word_length - 1
+            self._phases.append((first_bit_index // self.BITS_PER_BYTE,
+                                 (last_bit_index // self.BITS_PER_BYTE) + 1,
+                                 (self.BITS_PER_BYTE - 1) - (last_bit_index % self.BITS_PER_BYTE)))
+
     def read_word(self):
         """
         Return the next word in the sequence. Should not be called more than ``total_word_count`` times.
@@ -55,6 +85,73 @@ class BigEndianAscendingWordDeserializer:
         self.current_word_index += 1
         return word
 
+    def read_words(self, count):
+        """
+        Return the next ``count`` words in the sequence. Equivalent to calling
+        ``read_word()`` ``count`` times, but the bits are unpacked with NumPy.
+
+        :param int count: the number of words to read. The words read in total
+            should not exceed ``total_word_count``.
+        :returns: the words, as their unsigned bits. (64 bit words that
+            ``read_word()`` returns as signed longs can be recovered with
+            ``view(numpy.int64)``.)
+        :rtype: numpy.ndarray
+        """
+        first_bit_index = self.current_word_index * self._word_length
+        last_byte_index = self._byte_padding + ((first_bit_index + (count * self._word_length) + self.BITS_PER_BYTE - 1) // self.BITS_PER_BYTE)
+        if last_byte_index > len(self._bytes):
+            raise ValueError("Word out of bounds of backing array, {} >= {}".format(last_byte_index - 1, len(self._bytes)))
+        self.current_word_index += count
+
+        if self._byte_aligned and self._period_byte_count in (1, 2, 4, 8):
+            # The words are big-endian NumPy integers as they are.
+            first_byte_index = self._byte_padding + (first_bit_index // self.BITS_PER_BYTE)
+            return np.frombuffer(self._bytes, dtype='>u{}'.format(self._period_byte_count), count=count, offset=first_byte_index).astype(np.uint64)
+
+        data = np.frombuffer(self._bytes, dtype=np.uint8, count=last_byte_index - self._byte_padding, offset=self._byte_padding)
+
+        period_bit_count = self._period_byte_count * self.BITS_PER_BYTE
+        if (self._period_byte_count <= 8) and (first_bit_index % period_bit_count == 0):
+            # A whole period of words fits in a long (e.g. 8 five bit registers in
+            # 5 bytes), so read the periods as big-endian longs and split each one
+            # into its words at once.
+            period_count = -(-count // self._period_word_count)
+            period_bytes = np.zeros(period_count * self._period_byte_count, dtype=np.uint8)
+            period_data = data[first_bit_index // self.BITS_PER_BYTE:]
+            period_bytes[:len(period_data)] = period_data
+            period_longs = np.zeros((period_count, 8), dtype=np.uint8)
+            period_longs[:, 8 - self._period_byte_count:] = period_bytes.reshape(period_count, self._period_byte_count)
+            period_longs = period_longs.view('>u8').ravel().astype(np.uint64)
+            shifts = np.array([shift + (8 * (self._period_byte_count - end_byte_offset)) for _, end_byte_offset, shift in self._phases], dtype=np.uint64)
+            return ((period_longs[:, np.newaxis] >> shifts) & np.uint64(self._word_mask)).ravel()[:count]
+
+        if self._word_length <= 64 - (self.BITS_PER_BYTE - 1):
+            # Each word lies within the eight bytes starting at its first byte, so
+            # gather those as a big-endian long and shift the word down out of it.
+            first_bit_indices = first_bit_index + (np.arange(count, dtype=np.int64) * self._word_length)
+            padded = np.concatenate((data, np.zeros(self.BITS_PER_BYTE - 1, dtype=np.uint8)))
+            windows = np.lib.stride_tricks.as_strided(padded, shape=(len(data), 8), strides=(1, 1), writeable=False)
+            longs = windows[first_bit_indices // self.BITS_PER_BYTE].view('>u8').ravel().astype(np.uint64)
+            shifts = (64 - self._word_length - (first_bit_indices % self.BITS_PER_BYTE)).astype(np.uint64)
+            return (longs >> shifts) & np.uint64(self._word_mask)
+
+        bits = np.unpackbits(data)[first_bit_index:first_bit_index + (count * self._word_length)]
+
+        # left-pad each word to 64 bits and pack them as big-endian longs
+        word_bits = np.zeros((count, 64), dtype=np.uint8)
+        word_bits[:, 64 - self._word_length:] = bits.reshape(count, self._word_length)
+        return np.packbits(word_bits, axis=1).view('>u8').ravel().astype(np.uint64)
+
+    def read_all(self):
+        """
+        Return the remaining words in the sequence, up to ``total_word_count``.
+        Equivalent to ``read_words(total_word_count() - current_word_index)``.
+
+        :returns: the words, as their unsigned bits.
+        :rtype: numpy.ndarray
+        """
+        return self.read_words(self.word_count - self.current_word_index)
+
     def _read_word(self, position):
         """
         Reads the word at the specific sequence position (zero-indexed).
@@ -67,68 +164,28 @@ class BigEndianAscendingWordDeserializer:
         if position < 0:
             raise ValueError("Array index out of bounds for {position}".format(position=position))
 
-        # First bit of the word
-        first_bit_index = (position * self._word_length)
-        first_byte_index = (self._byte_padding + int(first_bit_index / self.BITS_PER_BYTE))
-        first_byte_skip_bits = int(first_bit_index % self.BITS_PER_BYTE)
-
-        # Last bit of the word
-        last_bit_index = (first_bit_index + self._word_length - 1)
-        last_byte_index = (self._byte_padding + int(last_bit_index / self.BITS_PER_BYTE))
-
-        bits_after_byte_boundary = int((last_bit_index + 1) % self.BITS_PER_BYTE)
-
-        # If the word terminates at the end of the last byte,, consume the whole
-        # last byte.
-        if bits_after_byte_boundary == 0:
-            last_byte_bits_to_consume = self.BITS_PER_BYTE
-        else:
-            # Otherwise, only consume what is necessary.
-            last_byte_bits_to_consume = bits_after_byte_boundary
-
-        if last_byte_index >= len(self._bytes):
+        if position >= self.word_count:
+            last_byte_index = self._byte_padding + ((((position + 1) * self._word_length) - 1) // self.BITS_PER_BYTE)
             raise ValueError("Word out of bounds of backing array, {} >= {}".format(last_byte_index, len(self._bytes)))
 
-        # Accumulator
-        value = 0
-
-        # -------------------------------------------------------------------
-        # First byte
-        bits_remaining_in_first_byte = (self.BITS_PER_BYTE - first_byte_skip_bits)
-        bits_to_consume_in_first_byte = min(bits_remaining_in_first_byte, self._word_length)
-        first_byte = self._bytes[first_byte_index]
-
-        # Mask off the bits to skip in the first byte.
-        first_byte_mask = (BitUtil.left_shift_long(1, bits_remaining_in_first_byte) - 1)
-        first_byte &= first_byte_mask
-
-        # Right-align relevant bits of first byte.
-        first_byte = BitUtil.unsigned_right_shift_long(
-            first_byte,
-            bits_remaining_in_first_byte - bits_to_consume_in_first_byte
-        )
-
-        value |= first_byte
-
-        # If the first byte contains the whold word, short-circuit.
-        if first_byte_index == last_byte_index:
-            return value
-
-        # -------------------------------------------------------------
-        # Middle bytes
-        middle_byte_count = int(last_byte_index - first_byte_index - 1)
-        for i in range(middle_byte_count):
-            middle_byte = self._bytes[first_byte_index + i + 1] & self.BYTE_MASK
-            # Push middle byte onto accumulator.
-            value = BitUtil.left_shift_long(value, self.BITS_PER_BYTE)
-            value |= middle_byte
-
-        # --------------------------------------------------
-        # Last byte
-        last_byte = (self._bytes[last_byte_index] & self.BYTE_MASK)
-        last_byte >>= self.BITS_PER_BYTE - last_byte_bits_to_consume
-        value = BitUtil.left_shift_long(value, last_byte_bits_to_consume)
-        value |= last_byte
+        if self._byte_aligned:
+            # Each word is its own period of whole bytes, so the bytes are the word.
+            first_byte_index = self._byte_padding + (position * self._period_byte_count)
+            value = int(hexlify(self._bytes_view[first_byte_index:first_byte_index + self._period_byte_count]), 16)
+        else:
+            # Locate the word from the position of its period and its place within it.
+            period_index, phase = divmod(position, self._period_word_count)
+            period_byte_index = self._byte_padding + (period_index * self._period_byte_count)
+            first_byte_offset, end_byte_offset, shift = self._phases[phase]
+
+            # Read the bytes spanning the word as one big-endian integer, then drop the
+            # unused bits of the last byte and the preceding bits of the first byte.
+            value = int(hexlify(self._bytes_view[period_byte_index + first_byte_offset:period_byte_index + end_byte_offset]), 16)
+            value = (value >> shift) & self._word_mask
+
+        # 64 bit words are signed longs.
+        if value > self.MAX_LONG:
+            value -= (1 << 64)
         return value
 
     def total_word_count(self):
@@ -172,9 +229,9 @@ class BigEndianAscendingWordSerializer:
     # The number of bits per byte.
     BITS_PER_BYTE = 8
 
-    # :var int bits_left_in_byte: Number of bits that remain writable in the current byte.
-    # :var int byte_index: Index of byte currently being written to.
-    # :var int words_written: Number of words written.
+    # :var int byte_padding: The number of leading padding bytes.
+    # :var int words_written: Number of words written. (The next word is written
+    #     ``words_written * word_length`` bits after the padding.)
 
     def __init__(self, word_length, word_count, byte_padding):
         """
@@ -190,23 +247,24 @@ class BigEndianAscendingWordSerializer:
         if word_count < 0:
             raise ValueError('Word count must be >= 0. (was: {})'.format(word_count))
         if byte_padding < 0:
-            raise ValueError('Byte padding must be must be >= 0. (was: {})'.format(byte_padding))
+            raise ValueError('Byte padding must be >= 0. (was: {})'.format(byte_padding))
 
         self._word_length = word_length
         self._word_count = word_count
 
         bits_required = word_length * word_count
-        leftover_bits = ((bits_required % self.BITS_PER_BYTE) != 0)
-        leftover_bits_inc = 0
-        if leftover_bits:
-            leftover_bits_inc = 1
-        bytes_required = (bits_required / self.BITS_PER_BYTE) + leftover_bits_inc + byte_padding
-        self._bytes = [0] * int(bytes_required)
-
-        self._bits_left_in_byte = self.BITS_PER_BYTE
-        self._byte_index = byte_padding
+        bytes_required = ((bits_required + self.BITS_PER_BYTE - 1) // self.BITS_PER_BYTE) + byte_padding
+        self._bytes = bytearray(bytes_required)
+
+        self._word_mask = (1 << word_length) - 1
+        self._byte_padding = byte_padding
         self._words_written = 0
 
+        # Word boundaries line up with byte boundaries again after a fixed number
+        # of words (the period). See ``write_words()``.
+        self._period_word_count = self.BITS_PER_BYTE // min(word_length & -word_length, self.BITS_PER_BYTE)
+        self._period_byte_count = (self._period_word_count * word_length) // self.BITS_PER_BYTE
+
     def write_word(self, word):
         """
         Writes the word to the backing array.
@@ -217,69 +275,103 @@ class BigEndianAscendingWordSerializer:
         if self._words_written == self._word_count:
             raise ValueError('Cannot write more words, backing array full!')
 
-        bits_left_in_word = self._word_length
+        # First and last bit of the word
+        first_bit_index = self._words_written * self._word_length
+        last_bit_index = first_bit_index + self._word_length - 1
 
-        while bits_left_in_word > 0:
-            # Move to the next byte if the current one is fully packed.
-            if self._bits_left_in_byte == 0:
-                self._byte_index += 1
-                self._bits_left_in_byte = self.BITS_PER_BYTE
+        first_byte_index = self._byte_padding + (first_bit_index // self.BITS_PER_BYTE)
+        last_byte_index = self._byte_padding + (last_bit_index // self.BITS_PER_BYTE)
+        byte_count = last_byte_index - first_byte_index + 1
 
-            consumed_mask = ~0 if bits_left_in_word == 64 else (BitUtil.left_shift_long(1, bits_left_in_word) - 1)
+        # Align the lowest bit of the word with the end of the last byte it occupies.
+        # (Signed words wrap to their two's complement bits.)
+        aligned_bits = (int(word) & self._word_mask) << ((self.BITS_PER_BYTE - 1) - (last_bit_index % self.BITS_PER_BYTE))
 
-            # Fix how many bits will be written in this cycle. Choose the
-            #  smaller of the remaining bits in the word or byte.
-            number_of_bits_to_write = min(self._bits_left_in_byte, bits_left_in_word)
-            bits_in_byte_remaining_after_write = self._bits_left_in_byte - number_of_bits_to_write
+        # Update the first byte, keeping the bits already written to it. The bytes
+        # after it have not been written to yet.
+        self._bytes[first_byte_index] |= aligned_bits >> (self.BITS_PER_BYTE * (byte_count - 1))
+        if byte_count > 1:
+            self._bytes[first_byte_index + 1:last_byte_index + 1] = unhexlify('%0*x' % (2 * byte_count, aligned_bits))[1:]
 
-            # In general, we write the highest bits of the word first, so we
-            # strip the highest bits that were consumed in previous cycles.
-            remaining_bits_of_word_to_write = (word & consumed_mask)
+        self._words_written += 1
 
-            # If the byte can accept all remaining bits, there is no need
-            # to shift off the bits that won't be written in this cycle.
-            bits_that_the_byte_can_accept = remaining_bits_of_word_to_write
+    def write_words(self, words):
+        """
+        Writes the words to the backing array, in order. Equivalent to calling
+        ``write_word()`` for each of them, but the bits are packed with NumPy.
 
-            # If there is more left in the word than can be written to this
-            # byte, shift off the bits that can't be written off the bottom.
-            if bits_left_in_word > number_of_bits_to_write:
-                bits_that_the_byte_can_accept = BitUtil.unsigned_right_shift_long(remaining_bits_of_word_to_write, bits_left_in_word - self._bits_left_in_byte)
-            else:
-                # If the byte can accept all remaining bits, there is no need
-                # to shift off the bits that won't be written in this cycle.
-                bits_that_the_byte_can_accept = remaining_bits_of_word_to_write
+        :param words: the words to write.
+        :type words: numpy.ndarray or list
+        :rtype: void
+        """
+        word_count = len(words)
+        if self._words_written + word_count > self._word_count:
+            raise ValueError('Cannot write more words, backing array full!')
+        if word_count == 0:
+            return
 
-            # Align the word bits to write up against the byte bits that have
-            # already been written. This shift may do nothing if the remainder
-            # of the byte is being consumed in this cycle.
-            aligned_bits = BitUtil.left_shift_long(bits_that_the_byte_can_accept, bits_in_byte_remaining_after_write)
+        first_bit_index = self._words_written * self._word_length
+        bit_offset = first_bit_index % self.BITS_PER_BYTE
 
-            # Update the byte with the alignedBits.
-            self._bytes[self._byte_index] |= BitUtil.to_signed_byte(aligned_bits)
+        # The bits of each word, highest first, following the bits already
+        # written to the current byte. (Signed words wrap to their two's
+        # complement bits.)
+        if isinstance(words, np.ndarray):
+            words = words.astype(np.uint64)
+        else:
+            words = np.fromiter((word & 0xFFFFFFFFFFFFFFFF for word in words), dtype=np.uint64, count=word_count)
+        period_bit_count = self._period_byte_count * self.BITS_PER_BYTE
+        if (self._period_byte_count in (1, 2, 4, 8)) and (self._period_word_count == 1):
+            # The words are written as big-endian NumPy integers as they are.
+            packed = words.astype('>u{}'.format(self._period_byte_count)).view(np.uint8)
+        elif (self._period_byte_count <= 8) and (first_bit_index % period_bit_count == 0):
+            # A whole period of words fits in a long (e.g. 8 five bit registers in
+            # 5 bytes), so shift the words of each period into place, OR them
+            # together and take the low bytes of the big-endian longs.
+            period_count = -(-word_count // self._period_word_count)
+            period_words = np.zeros(period_count * self._period_word_count, dtype=np.uint64)
+            period_words[:word_count] = words & np.uint64(self._word_mask)
+            shifts = np.arange(self._period_word_count - 1, -1, -1, dtype=np.uint64) * np.uint64(self._word_length)
+            period_longs = np.bitwise_or.reduce(period_words.reshape(period_count, self._period_word_count) << shifts, axis=1)
+            period_bytes = period_longs.astype('>u8').view(np.uint8).reshape(period_count, 8)[:, 8 - self._period_byte_count:]
+            packed = period_bytes.ravel()[:-(-(word_count * self._word_length) // self.BITS_PER_BYTE)]
+        else:
+            shifts = np.arange(self._word_length - 1, -1, -1, dtype=np.uint64)
+            bits = ((words[:, np.newaxis] >> shifts) & np.uint64(1)).astype(np.uint8).ravel()
+            packed = np.packbits(np.concatenate((np.zeros(bit_offset, dtype=np.uint8), bits)))
 
-            # Update state with bit count written.
-            bits_left_in_word -= number_of_bits_to_write
-            self._bits_left_in_byte = bits_in_byte_remaining_after_write
+        # Update the bytes, keeping the bits already written to the first one.
+        start = self._byte_padding + (first_bit_index // self.BITS_PER_BYTE)
+        end = start + len(packed)
+        packed[0] |= self._bytes[start]
+        self._bytes[start:end] = packed.tobytes()
 
-        self._words_written += 1
+        self._words_written += word_count
 
     def get_bytes(self):
         """
         Returns the backing array of ``byte``'s that contain the serialized words.
 
-        :returns: the serialized words as a list of bytes.
-        :rtype: list
+        :returns: the serialized words as unsigned bytes.
+        :rtype: bytearray
         """
         if self._words_written < self._word_count:
             raise ValueError('Not all words have been written! ({}/{})'.format(self._words_written, self._word_count))
         return self._bytes
 
 
-class HLLMetadata:
+class HLLMetadata(object):
     """
     The metadata and parameters associated with a HLL.
     """
 
+    # NOTE:  one is created for every HLL serialized or deserialized, so no
+    #        per-instance ``__dict__`` is allocated.
+    __slots__ = (
+        '_schema_version', '_type', '_register_count_log2', '_register_width',
+        '_log2_explicit_cutoff', '_explicit_off', '_explicit_auto', '_sparse_enabled',
+    )
+
     def __init__(self, schema_version, type, register_count_log2, register_width, log2_explicit_cutoff, explicit_off, explicit_auto, sparse_enabled):
         """
         :param int schema_version: the schema version number of the HLL. This must
@@ -396,6 +488,9 @@ class SchemaVersionOne:
         HLLType.FULL
     ]
 
+    # The inverse of TYPE_ORDINALS.
+    ORDINALS_BY_TYPE = dict((type, ordinal) for ordinal, type in enumerate(TYPE_ORDINALS))
+
     # number of header bytes for all HLL types
     HEADER_BYTE_COUNT = 3
 
@@ -419,7 +514,7 @@ class SchemaVersionOne:
         """
         Writes metadata bytes to serialized HLL.
 
-        :param list bytes: the padded data bytes of the HLL
+        :param bytearray bytes: the padded data bytes of the HLL
         :param HLLMetadata metadata: the metadata to write to the padding bytes
         :rtype: void
         """
@@ -506,7 +601,7 @@ class SchemaVersionOne:
                  This will always be non-negative.
         :rtype: int
         """
-        return cls.TYPE_ORDINALS.index(type)
+        return cls.ORDINALS_BY_TYPE[type]
 
     @classmethod
     def _get_type(cls, ordinal):
@@ -534,14 +629,14 @@ class SerializationUtil:
     REGISTER_WIDTH_BITS = 3
 
     # A mask to cap the maximum value of the register width.
-    REGISTER_WIDTH_MASK = BitUtil.left_shift_int(1, REGISTER_WIDTH_BITS) - 1
+    REGISTER_WIDTH_MASK = (1 << REGISTER_WIDTH_BITS) - 1
 
     # The number of bits (of the parameters byte) dedicated to encoding
     # ``log2(register_count)``.
     LOG2_REGISTER_COUNT_BITS = 5
 
     # A mask to cap the maximum value of ``log2(register_count)``.
-    LOG2_REGISTER_COUNT_MASK = BitUtil.left_shift_int(1, LOG2_REGISTER_COUNT_BITS) - 1
+    LOG2_REGISTER_COUNT_MASK = (1 << LOG2_REGISTER_COUNT_BITS) - 1
 
     # The number of bits (of the cutoff byte) dedicated to encoding the
     # log-base-2 of the explicit cutoff or sentinel values for
@@ -549,13 +644,13 @@ class SerializationUtil:
     EXPLICIT_CUTOFF_BITS = 6
 
     # A mask to cap the maximum value of the explicit cutoff choice.
-    EXPLICIT_CUTOFF_MASK = BitUtil.left_shift_int(1, EXPLICIT_CUTOFF_BITS) - 1
+    EXPLICIT_CUTOFF_MASK = (1 << EXPLICIT_CUTOFF_BITS) - 1
 
     # Number of bits in a nibble.
     NIBBLE_BITS = 4
 
     # A mask to cap the maximum value of a nibble.
-    NIBBLE_MASK = BitUtil.left_shift_int(1, NIBBLE_BITS) - 1
+    NIBBLE_MASK = (1 << NIBBLE_BITS) - 1
 
     # ************************************************************************
     # Serialization utilities
@@ -622,7 +717,7 @@ class SerializationUtil:
         :returns: the packed version byte
         :rtype: byte
         """
-        return BitUtil.to_signed_byte(BitUtil.left_shift_int(cls.NIBBLE_MASK & schema_version, cls.NIBBLE_BITS) | (cls.NIBBLE_MASK & type_ordinal))
+        return (((cls.NIBBLE_MASK & schema_version) << cls.NIBBLE_BITS) | (cls.NIBBLE_MASK & type_ordinal)) & 0xFF
 
     @classmethod
     def pack_cutoff_byte(cls, explicit_cutoff, sparse_enabled):
@@ -643,8 +738,8 @@ class SerializationUtil:
                storage.
         :rtype: byte
         """
-        sparse_bit = BitUtil.left_shift_int(1, cls.EXPLICIT_CUTOFF_BITS) if sparse_enabled else 0
-        return BitUtil.to_signed_byte(sparse_bit | (cls.EXPLICIT_CUTOFF_MASK & explicit_cutoff))
+        sparse_bit = (1 << cls.EXPLICIT_CUTOFF_BITS) if sparse_enabled else 0
+        return (sparse_bit | (cls.EXPLICIT_CUTOFF_MASK & explicit_cutoff)) & 0xFF
 
     @classmethod
     def pack_parameters_byte(cls, register_width, register_count_log2):
@@ -665,7 +760,7 @@ class SerializationUtil:
         """
         width_bits = (register_width - 1) & cls.REGISTER_WIDTH_MASK
         count_bits = register_count_log2 & cls.LOG2_REGISTER_COUNT_MASK
-        return BitUtil.to_signed_byte(BitUtil.to_signed_byte(BitUtil.left_shift_int(width_bits, cls.LOG2_REGISTER_COUNT_BITS) | count_bits))
+        return ((width_bits << cls.LOG2_REGISTER_COUNT_BITS) | count_bits) & 0xFF
 
     @classmethod
     def sparse_enabled(cls, cutoff_byte):
@@ -676,7 +771,7 @@ class SerializationUtil:
         :returns: the 'sparse-enabled' boolean
         :rtype: boolean
         """
-        return (BitUtil.unsigned_right_shift_byte(cutoff_byte, cls.EXPLICIT_CUTOFF_BITS) & 1) == 1
+        return ((cutoff_byte >> cls.EXPLICIT_CUTOFF_BITS) & 1) == 1
 
     @classmethod
     def explicit_cutoff(cls, cutoff_byte):
@@ -698,7 +793,7 @@ class SerializationUtil:
         :returns: the schema version of the serialized HLL
         :rtype: int
         """
-        return cls.NIBBLE_MASK & BitUtil.unsigned_right_shift_byte(version_byte, cls.NIBBLE_BITS)
+        return cls.NIBBLE_MASK & (version_byte >> cls.NIBBLE_BITS)
 
     @classmethod
     def type_ordinal(cls, version_byte):
@@ -720,7 +815,7 @@ class SerializationUtil:
         :returns: the register width of the serialized HLL
         :rtype: int
         """
-        return (BitUtil.unsigned_right_shift_byte(parameters_byte, cls.LOG2_REGISTER_COUNT_BITS) & cls.REGISTER_WIDTH_MASK) + 1
+        return ((parameters_byte >> cls.LOG2_REGISTER_COUNT_BITS) & cls.REGISTER_WIDTH_MASK) + 1
 
     @classmethod
     def register_count_log2(cls, parameters_byte):
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from binascii import hexlify, unhexlify
 from math import log
 import numpy as np
 
@@ -9,99 +10,46 @@ class BitUtil:
     A collection of bit utilities.
     """
 
-    # The set of least-significant bits for a given ``byte``. ``-1``
-    # is used if no bits are set (so as to not be confused with "index of zero"
-    # meaning that the least significant bit is the 0th (1st) bit).
-    LEAST_SIGNIFICANT_BIT = [
-        -1, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        5, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        6, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        5, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        7, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        5, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        6, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        5, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0,
-        4, 0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0
-    ]
-
     @classmethod
     def least_significant_bit(cls, value):
         """
         Computes the least-significant bit of the specified ``long``
         that is set to ``1``. Zero-indexed.
 
-        See <http://stackoverflow.com/questions/757059/position-of-least-significant-bit-that-is-set>
-        and <http://www-graphics.stanford.edu/~seander/bithacks.html>.
+        ``value & -value`` isolates the lowest set bit (also of a negative,
+        two's complement ``long``), whose index is one less than its length.
 
         :param long value: the ``long`` whose least-significant bit is desired.
         :returns: the least-significant bit of the specified ``long``.
                   ``-1`` is returned if there are no bits set.
         :rtype: int
         """
-
+        value = int(value)
         if value == 0:
             # by contract
             return -1
-
-        elif value & 0xFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 0) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 0
-
-        elif value & 0xFFFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 8) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 8
-
-        elif value & 0xFFFFFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 16) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 16
-
-        elif value & 0xFFFFFFFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 24) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 24
-
-        elif value & 0xFFFFFFFFFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 32) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 32
-
-        elif value & 0xFFFFFFFFFFFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 40) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 40
-
-        elif value & 0xFFFFFFFFFFFFFF != 0:
-            index = int(cls.unsigned_right_shift_long(value, 48) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 48
-
-        else:
-            index = int(cls.unsigned_right_shift_long(value, 56) & 0xFF)
-            return cls.LEAST_SIGNIFICANT_BIT[index] + 56
+        return (value & -value).bit_length() - 1
 
     @classmethod
     def unsigned_right_shift_long(cls, val, n):
         """
         Equivalent to Java >>> on a long value
         """
-        return val if n == 0 else int(np.uint64(val) >> np.uint64(n))
+        return val if n == 0 else (int(val) & 0xFFFFFFFFFFFFFFFF) >> n
 
     @classmethod
     def unsigned_right_shift_int(cls, val, n):
         """
         Equivalent to Java >>> on an int value
         """
-        return val if n == 0 else int(np.uint32(val) >> np.uint32(n))
+        return val if n == 0 else (int(val) & 0xFFFFFFFF) >> n
 
     @classmethod
     def unsigned_right_shift_byte(cls, val, n):
         """
         Equivalent to Java >>> on a byte value
         """
-        return val if n == 0 else int(np.uint32(val) >> np.uint32(n))
+        return val if n == 0 else (int(val) & 0xFFFFFFFF) >> n
 
     @classmethod
     def to_signed_byte(cls, i):
@@ -123,11 +71,10 @@ class BitUtil:
         :returns: left shift result for, x << y
         :rtype: long
         """
-        x = np.int64(long_x)
-        y = np.int(int_y)
-        z = np.left_shift(x, y)
+        z = (int(long_x) << int_y) & 0xFFFFFFFFFFFFFFFF
 
-        return np.int64(z.item())
+        # wrap to a signed (two's complement) long
+        return z - (1 << 64) if z & 0x8000000000000000 else z
 
     @classmethod
     def left_shift_int(cls, int_x, int_y):
@@ -139,11 +86,8 @@ class BitUtil:
         :returns: left shift result for, x << y
         :rtype: int
         """
-        x = np.int32(int_x)
-        y = np.int(int_y)
-        z = np.left_shift(x, y)
-
-        return z.item()
+        x = ((int(int_x) + 0x80000000) & 0xFFFFFFFF) - 0x80000000  # converts to signed int
+        return cls.left_shift_long(x, int_y)
 
     @classmethod
     def left_shift_byte(cls, byte_x, int_y):
@@ -155,33 +99,22 @@ class BitUtil:
         :returns: left shift result for, x << y
         :rtype: int
         """
-        x = np.int8(byte_x)  # converts to signed byte, since byte is signed in java
-        y = np.int(int_y)
-        z = np.left_shift(x, y)
+        x = ((int(byte_x) + 0x80) & 0xFF) - 0x80  # converts to signed byte, since byte is signed in java
 
         # In Java, (byte)128 << 3 produces an int.
-        return z.item()
+        return cls.left_shift_long(x, int_y)
 
 
 class LongIterator:
     """
-    A ``long``-based iterator.
+    A ``long``-based iterator over the registers of a ``BitVector``.
     """
 
-    LOG2_BITS_PER_WORD = 6
-    BITS_PER_WORD = BitUtil.left_shift_int(1, LOG2_BITS_PER_WORD)
-
-    def __init__(self, register_width, words, register_mask, count):
-        self._register_width = register_width
-        self._words = words
-        self._register_mask = register_mask
-        self._count = count
-
-        # register setup
-        self._register_index = 0
-        self._word_index = 0
-        self._remaining_word_bits = self.BITS_PER_WORD
-        self._word = self._words[self._word_index]
+    def __init__(self, registers):
+        """
+        :param numpy.ndarray registers: the register values to iterate over
+        """
+        self._registers = iter(registers.tolist())
 
     def __iter__(self):
         return self
@@ -191,48 +124,18 @@ class LongIterator:
         return self.next()
 
     def next(self):
-        if self._register_index >= self._count:
-            raise StopIteration
-
-        if self._remaining_word_bits >= self._register_width:
-            register = self._word & self._register_mask
-
-            # shift to the next register
-            self._word = BitUtil.unsigned_right_shift_long(self._word, self._register_width)
-            self._remaining_word_bits -= self._register_width
-        else:  # insufficient bits remaining in current word
-            self._word_index += 1  # move to the next word
-
-            register = (self._word | BitUtil.left_shift_long(self._words[self._word_index], self._remaining_word_bits)) & self._register_mask
+        return next(self._registers)
 
-            # shift to the next partial register (word)
-            self._word = BitUtil.unsigned_right_shift_long(self._words[self._word_index], self._register_width - self._remaining_word_bits)
-            self._remaining_word_bits += self.BITS_PER_WORD - self._register_width
 
-        self._register_index += 1
-        return register
-
-
-class BitVector:
+class BitVector(object):
     """
     A vector (array) of bits that is accessed in units ("registers") of ``width``
-    bits which are stored as 64bit "words" (``long``'s).  In this context
-    a register is at most 64bits.
-    """
-
-    # NOTE:  in this context, a word is 64bits
+    bits. In this context a register is at most 64bits.
 
-    # rather than doing division to determine how a bit index fits into 64bit
-    # words (i.e. longs), bit shifting is used
-    LOG2_BITS_PER_WORD = 6  # =>64bits
-    BITS_PER_WORD = BitUtil.left_shift_int(1, LOG2_BITS_PER_WORD)
-    BITS_PER_WORD_MASK = BITS_PER_WORD - 1
-
-    # ditto from above but for bytes (for output)
-    LOG2_BITS_PER_BYTE = 3  # =>8bits
-    BITS_PER_BYTE = BitUtil.left_shift_int(1, LOG2_BITS_PER_BYTE)
-
-    BYTES_PER_WORD = 8  # 8 bytes in a long
+    The registers are held unpacked, one per NumPy array element, so that they
+    can be read and updated in bulk (see ``as_uint8_array()``). They are only
+    packed into ``width`` bit words when serialized (see ``get_register_contents()``).
+    """
 
     def __init__(self, width, count):
         """
@@ -240,13 +143,11 @@ class BitVector:
                zero or greater than 63 (the signed word size).
         :param long count: the number of registers.  This cannot be negative or zero
         """
-        # 64bit words
-        # ceil((width * count)/BITS_PER_WORD)
-        self._words = [0] * BitUtil.unsigned_right_shift_long((width * count) + self.BITS_PER_WORD_MASK, self.LOG2_BITS_PER_WORD)
         # the width of a register in bits (this cannot be more than 64 (the word size))
         self._register_width = width
         self._count = count
-        self._register_mask = BitUtil.left_shift_long(1, width) - 1
+        self._register_mask = (1 << width) - 1
+        self._registers = np.zeros(count, dtype=np.uint8 if width <= 8 else np.uint64)
 
     def get_register(self, register_index):
         """
@@ -255,17 +156,7 @@ class BitVector:
         :returns: the value at the specified register index
         :rtype: long
         """
-        # NOTE:  if this changes then setMaxRegister() must change
-        bit_index = register_index * self._register_width
-        first_word_index = BitUtil.unsigned_right_shift_long(bit_index, self.LOG2_BITS_PER_WORD)  # aka (bitIndex / BITS_PER_WORD)
-        second_word_index = BitUtil.unsigned_right_shift_long(bit_index + self._register_width - 1, self.LOG2_BITS_PER_WORD)  # see above
-        bit_remainder = bit_index & self.BITS_PER_WORD_MASK  # aka (bitIndex % BITS_PER_WORD)
-
-        if first_word_index == second_word_index:
-            return BitUtil.unsigned_right_shift_long(self._words[first_word_index], bit_remainder) & self._register_mask
-        # else -- register spans words
-        return BitUtil.unsigned_right_shift_long(self._words[first_word_index], bit_remainder) | \
-            BitUtil.left_shift_long(self._words[second_word_index], self.BITS_PER_WORD - bit_remainder) & self._register_mask
+        return int(self._registers[register_index])
 
     def set_register(self, register_index, value):
         """
@@ -274,23 +165,7 @@ class BitVector:
         :param long value: the value to set in the register
         :rtype: long
         """
-        # NOTE:  if this changes then setMaxRegister() must change
-        bit_index = register_index * self._register_width
-        first_word_index = BitUtil.unsigned_right_shift_long(bit_index, self.LOG2_BITS_PER_WORD)  # aka (bitIndex / BITS_PER_WORD)
-        second_word_index = BitUtil.unsigned_right_shift_long(bit_index + self._register_width - 1, self.LOG2_BITS_PER_WORD)  # see above
-        bit_remainder = bit_index & self.BITS_PER_WORD_MASK  # aka (bitIndex % BITS_PER_WORD)
-
-        if first_word_index == second_word_index:
-            # clear then set
-            self._words[first_word_index] &= ~BitUtil.left_shift_long(self._register_mask, bit_remainder)
-            self._words[first_word_index] |= BitUtil.left_shift_long(value, bit_remainder)
-        else:  # register spans words
-            # clear then set each partial word
-            self._words[first_word_index] &= BitUtil.left_shift_long(1, bit_remainder) - 1
-            self._words[first_word_index] |= BitUtil.left_shift_long(value, bit_remainder)
-
-            self._words[second_word_index] &= ~BitUtil.unsigned_right_shift_long(self._register_mask, self.BITS_PER_WORD - bit_remainder)
-            self._words[second_word_index] |= BitUtil.unsigned_right_shift_long(value, self.BITS_PER_WORD - bit_remainder)
+        self._registers[register_index] = value & self._register_mask
 
     def register_iterator(self):
         """
@@ -298,7 +173,7 @@ class BitVector:
                   with index zero. This will never be ``None``.
         :rtype: LongIterator
         """
-        return LongIterator(self._register_width, self._words, self._register_mask, self._count)
+        return LongIterator(self._registers)
 
     def set_max_register(self, register_index, value):
         """
@@ -317,37 +192,41 @@ class BitVector:
                   otherwise.
         :rtype: boolean
         """
-        # NOTE:  if this changes then setRegister() must change
-        bit_index = register_index * self._register_width
-        first_word_index = BitUtil.unsigned_right_shift_long(bit_index, self.LOG2_BITS_PER_WORD)  # aka (bitIndex / BITS_PER_WORD)
-        second_word_index = BitUtil.unsigned_right_shift_long(bit_index + self._register_width - 1, self.LOG2_BITS_PER_WORD)  # see above
-        bit_remainder = bit_index & self.BITS_PER_WORD_MASK  # aka (bitIndex % BITS_PER_WORD)
-
-        if first_word_index == second_word_index:
-            register_value = BitUtil.unsigned_right_shift_long(self._words[first_word_index], bit_remainder) & self._register_mask
-        else:  # register spans words
-            # # no need to mask since at top of word
-            register_value = BitUtil.unsigned_right_shift_long(self._words[first_word_index], bit_remainder) | \
-               BitUtil.left_shift_long(self._words[second_word_index], self.BITS_PER_WORD - bit_remainder) & self._register_mask
-
-        # determine which is the larger and update as necessary
+        register_value = int(self._registers[register_index])
         if value > register_value:
-            # NOTE:  matches setRegister()
-            if first_word_index == second_word_index:
-                # clear then set
-                self._words[first_word_index] &= ~BitUtil.left_shift_long(self._register_mask, bit_remainder)
-                self._words[first_word_index] |= BitUtil.left_shift_long(value, bit_remainder)
-            else:  # register spans words
-                # clear then set each partial word
-                self._words[first_word_index] &= BitUtil.left_shift_long(1, bit_remainder) - 1
-                self._words[first_word_index] |= BitUtil.left_shift_long(value,  bit_remainder)
-
-                self._words[second_word_index] &= ~BitUtil.unsigned_right_shift_long(self._register_mask, self.BITS_PER_WORD - bit_remainder)
-                self._words[second_word_index] |= BitUtil.unsigned_right_shift_long(value, self.BITS_PER_WORD - bit_remainder)
+            self._registers[register_index] = value
         # else -- the register value is greater (or equal) so nothing needs to be done
 
         return value >= register_value
 
+    def merge_max(self, other):
+        """
+        Sets each register to the maximum of its value and the value of the
+        same register in ``other``.
+
+        :param BitVector other: a vector of the same width and count. This cannot be ``None``.
+        :rtype: void
+        """
+        np.maximum(self._registers, other._registers, out=self._registers)
+
+    def merge_max_sparse(self, register_indices, values, distinct=False):
+        """
+        Equivalent to calling ``set_max_register()`` for each index and value
+        pair, in any order.
+
+        :param numpy.ndarray register_indices: the indices of the registers to set.
+               These cannot be negative but may repeat.
+        :param numpy.ndarray values: the values to set, one per index
+        :param boolean distinct: flag indicating that ``register_indices`` do not
+               repeat, so that the merge can be a single gather/maximum/scatter
+               rather than the unbuffered ``numpy.maximum.at``.
+        :rtype: void
+        """
+        if distinct:
+            self._registers[register_indices] = np.maximum(self._registers[register_indices], values)
+        else:
+            np.maximum.at(self._registers, register_indices, values)
+
     def fill(self, value):
         """
         Fills this bit vector with the specified bit value.  This can be used to
@@ -356,8 +235,47 @@ class BitVector:
         :param long value: the value to set all bits to (only the lowest bit is used)
         :rtype: void
         """
-        for i in range(self._count):
-            self.set_register(i, value)
+        self._registers.fill(value & self._register_mask)
+
+    def clone(self):
+        """
+        :returns: a copy of this vector that shares no storage with it.
+        :rtype: BitVector
+        """
+        clone = BitVector.__new__(BitVector)
+        clone._register_width = self._register_width
+        clone._count = self._count
+        clone._register_mask = self._register_mask
+        clone._registers = self._registers.copy()
+        return clone
+
+    def clone_and_merge_sparse(self, register_indices, values):
+        """
+        Equivalent to ``clone()`` followed by ``merge_max_sparse()`` of
+        distinct indices on the clone.
+
+        :param numpy.ndarray register_indices: the distinct indices of the
+               registers to merge. These cannot be negative.
+        :param numpy.ndarray values: the values to merge, one per index
+        :returns: a copy of this vector with the values merged into it.
+        :rtype: BitVector
+        """
+        clone = self.clone()
+        clone.merge_max_sparse(register_indices, values, distinct=True)
+        return clone
+
+    def as_uint8_array(self):
+        """
+        Exposes the registers for bulk reads and updates. The returned array
+        is the vector's own storage, so writes to it are writes to the registers
+        and must not exceed the register width.
+
+        :returns: the registers, one per element. This will never be ``None``.
+        :rtype: numpy.ndarray
+        """
+        if self._registers.dtype != np.uint8:
+            raise ValueError("Registers of width {} do not fit in a byte.".format(self._register_width))
+        return self._registers
 
     def get_register_contents(self, serializer):
         """
@@ -366,10 +284,17 @@ class BitVector:
         :param BigEndianAscendingWordSerializer serializer: the serializer to use. This cannot be ``None``.
         :rtype: void
         """
-        iterator = self.register_iterator()
+        serializer.write_words(self._registers)
 
-        for itr in iterator:
-            serializer.write_word(itr)
+    def set_register_contents(self, deserializer):
+        """
+        Sets the registers of the vector to the next ``count`` words read by
+        the specified deserializer.
+
+        :param BigEndianAscendingWordDeserializer deserializer: the deserializer to use. This cannot be ``None``.
+        :rtype: void
+        """
+        self._registers[:] = deserializer.read_words(self._count) & np.uint64(self._register_mask)
 
 
 class NumberUtil:
@@ -383,6 +308,10 @@ class NumberUtil:
     # the hex characters
     HEX = ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'A', 'B', 'C', 'D', 'E', 'F']
 
+    # the value of each hex character (of either case)
+    HEX_DIGITS = dict((character, digit) for digit, character in enumerate(HEX))
+    HEX_DIGITS.update((character.lower(), digit) for digit, character in enumerate(HEX))
+
     @classmethod
     def log2(cls, value):
         """
@@ -393,6 +322,10 @@ class NumberUtil:
         :returns: the ``log2`` of the specified value
         :rtype: float
         """
+        if isinstance(value, int) and value > 0 and (value & (value - 1)) == 0:
+            # a power of two (e.g. a register count), whose log2 is its bit index
+            return float(value.bit_length() - 1)
+
         # REF:  http://en.wikipedia.org/wiki/Logarithmic_scale (conversion of bases)
         return log(value) / cls.LOGE_2
 
@@ -402,7 +335,7 @@ class NumberUtil:
         Converts the specified array of ``byte``'s into a string of
         hex characters (low ``byte`` first).
 
-        :param list bytes: the array of ``byte``'s that are to be converted.
+        :param bytearray bytes: the array of ``byte``'s that are to be converted.
                This cannot be ``None`` though it may be empty.
         :param int offset: the offset in ``bytes`` at which the bytes will
                be taken.  This cannot be negative and must be less than
@@ -422,16 +355,11 @@ class NumberUtil:
         byte_count = min(len(bytes) - offset, count)
         upper_bound = byte_count + offset
 
-        chars = [None] * (byte_count * 2)   # two chars per byte
-        char_index = 0
-        for i in range(offset, upper_bound):
-            value = bytes[i]
-            chars[char_index] = cls.HEX[(BitUtil.unsigned_right_shift_byte(value, 4)) & 0x0F]
-            char_index += 1
-            chars[char_index] = cls.HEX[value & 0x0F]
-            char_index += 1
-
-        return ''.join(chars)
+        data = bytes[offset:upper_bound]
+        if not isinstance(data, (bytearray, memoryview, type(b''))):
+            # e.g. a list of Java's signed bytes
+            data = bytearray(byte & 0xFF for byte in data)
+        return hexlify(data).decode('ascii').upper()
 
     @classmethod
     def from_hex(cls, string, offset, count):
@@ -450,7 +378,7 @@ class NumberUtil:
                   specified string (in the specified range).  This will never be
                   ``None`` though it may be empty if ``string``
                   is empty or ``count`` is zero.
-        :rtype: list
+        :rtype: bytearray
         """
 
         if offset >= len(string):  # by contract
@@ -462,16 +390,14 @@ class NumberUtil:
         char_count = min(len(string) - offset, count)
         upper_bound = offset + char_count
 
-        byte_array = [0] * (BitUtil.unsigned_right_shift_int(char_count, 1))  # aka /2
-        byte_index = 0  # beginning
-        for i in range(0, upper_bound, 2):
-            p1 = BitUtil.left_shift_int(cls._digit(string[i]), 4)
-            p2 = cls._digit(string[i+1])
-            p = (p1 | p2) & 0xFF
-
-            byte_array[byte_index] = BitUtil.to_signed_byte(p)
-            byte_index += 1
-        return byte_array
+        hex_string = string[offset:upper_bound]
+        try:
+            return bytearray(unhexlify(hex_string))
+        except (TypeError, ValueError):
+            # report the first character that is not a hex digit
+            for character in hex_string:
+                cls._digit(character)
+            raise
 
     @classmethod
     def _digit(cls, character):
@@ -482,37 +408,11 @@ class NumberUtil:
                   through ``15``.
         :rtype: int
         """
-        if character == '0':
-            return 0
-        elif character == '1':
-            return 1
-        elif character == '2':
-            return 2
-        elif character == '3':
-            return 3
-        elif character == '4':
-            return 4
-        elif character == '5':
-            return 5
-        elif character == '6':
-            return 6
-        elif character == '7':
-            return 7
-        elif character == '8':
-            return 8
-        elif character == '9':
-            return 9
-        elif character in ['a', 'A']:
-            return 10
-        elif character in ['b', 'B']:
-            return 11
-        elif character in ['c', 'C']:
-            return 12
-        elif character in ['d', 'D']:
-            return 13
-        elif character in ['e', 'E']:
-            return 14
-        elif character in ['f', 'F']:
-            return 15
-        else:
+        digit = cls.HEX_DIGITS.get(character)
+        if digit is None:
+            # NOTE:  non-ASCII characters are escaped so that the message stays
+            #        a plain ``str`` on Python 2
+            if ord(character) >= 128:
+                character = '\\x{:02x}'.format(ord(character)) if ord(character) < 256 else '\\u{:04x}'.format(ord(character))
             raise Exception("Character is not in [a-fA-F0-9]: ({})".format(character))
+        return digit
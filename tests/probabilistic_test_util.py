@@ -3,6 +3,7 @@
 from __future__ import division
 from python_hll.util import BitUtil
 from math import ceil
+import numpy as np
 
 
 def construct_hll_value(log2m, register_index, register_value):
@@ -23,11 +24,29 @@ def construct_hll_value(log2m, register_index, register_value):
     return BitUtil.left_shift_long(substream_value, log2m) | partition
 
 
+def construct_hll_values(log2m, register_indices, register_values):
+    """
+    ``construct_hll_value()`` for arrays of register indices and values, e.g.
+    to be added with ``HLL.add_raw_batch()``.
+
+    :param log2m: The log-base-2 of the number of registers in the HLL
+    :type log2m: int
+    :param register_indices: The indices of the registers to set
+    :type register_indices: numpy.ndarray
+    :param register_values: the values to set the registers to
+    :type register_values: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+    partitions = np.asarray(register_indices, dtype=np.uint64)
+    substream_values = np.left_shift(np.uint64(1), np.asarray(register_values, dtype=np.uint64) - np.uint64(1))
+    return (np.left_shift(substream_values, np.uint64(log2m)) | partitions).view(np.int64)
+
+
 def get_register_index(raw_value, log2m):
     """
     Extracts the HLL register index from a raw value.
     """
-    m_bits_mask = BitUtil.left_shift_int(1, log2m) - 1
+    m_bits_mask = (1 << log2m) - 1
     j = raw_value & m_bits_mask
     return j
 
@@ -48,6 +67,19 @@ def get_register_value(raw_value, log2m):
     return p_w
 
 
+def get_register_values(raw_values, log2m):
+    """
+    ``get_register_value()`` for an array of raw values.
+
+    :rtype: numpy.ndarray
+    """
+    substream_values = np.asarray(raw_values, dtype=np.int64).view(np.uint64) >> np.uint64(log2m)
+    # (x & -x) isolates the least significant set bit, which log2() finds exactly
+    lsb = substream_values & (~substream_values + np.uint64(1))
+    p_w = np.minimum(np.log2(np.maximum(lsb, 1)).astype(np.int8) + 1, 31)
+    return np.where(substream_values == 0, 0, p_w).astype(np.int8)
+
+
 def get_required_bytes(short_word_length, register_count):
     """
     Returns the number of bytes required to pack ``register_count``
@@ -79,6 +79,61 @@ def test_random_smoke(fastonly):
         word_length += 1
 
 
+def test_read_words():
+    """
+    Tests that ``read_words()`` and ``read_all()`` read the same words as repeated
+    ``read_word()``, including when they are interleaved.
+    """
+    random.seed(1)
+    for word_length in [1, 5, 6, 8, 12, 13, 16, 31, 57, 58, 63, 64]:
+        for byte_padding in [0, 3]:
+            word_count = 29
+            serializer = BigEndianAscendingWordSerializer(word_length, word_count, byte_padding)
+            for _ in range(word_count):
+                serializer.write_word(random.getrandbits(word_length) - (1 << 63 if word_length == 64 else 0))
+            bytes_ = serializer.get_bytes()
+
+            deserializer = BigEndianAscendingWordDeserializer(word_length, byte_padding, bytes_)
+            expected = [deserializer.read_word() for _ in range(word_count)]
+
+            deserializer = BigEndianAscendingWordDeserializer(word_length, byte_padding, bytes_)
+            words = [deserializer.read_word()]
+            words += deserializer.read_words(10).tolist()
+            words += deserializer.read_words(0).tolist()
+            words += deserializer.read_words(word_count - 11).tolist()
+            if word_length == 64:
+                # 64 bit words are read as signed longs
+                words = [word - (1 << 64) if word >= (1 << 63) else word for word in words]
+
+            assert words == expected
+
+            # starting on a byte boundary
+            deserializer = BigEndianAscendingWordDeserializer(word_length, byte_padding, bytes_)
+            words = deserializer.read_words(8).tolist()
+            words += deserializer.read_words(word_count - 8).tolist()
+            if word_length == 64:
+                words = [word - (1 << 64) if word >= (1 << 63) else word for word in words]
+
+            assert words == expected
+
+            deserializer = BigEndianAscendingWordDeserializer(word_length, byte_padding, bytes_)
+            words = [deserializer.read_word()]
+            words += deserializer.read_all().tolist()
+            if word_length == 64:
+                words = [word - (1 << 64) if word >= (1 << 63) else word for word in words]
+
+            assert words[:word_count] == expected
+            assert len(words) == deserializer.total_word_count()
+
+    # Should complain about reading past the end of the backing array
+    deserializer = BigEndianAscendingWordDeserializer(8, 0, [1, 2])
+    try:
+        deserializer.read_words(3)
+        assert False, "Should complain about reading too many words."
+    except ValueError as e:
+        assert "Word out of bounds of backing array" in str(e)
+
+
 def run_random_test(word_length, byte_padding, word_count, seed):
     """
     Runs a test which serializes and deserializes random word values.
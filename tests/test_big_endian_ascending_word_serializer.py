@@ -3,6 +3,8 @@
 
 """Unit tests for BigEndianAscendingWordSerializer """
 
+import random
+import numpy as np
 from python_hll.serialization import BigEndianAscendingWordSerializer
 
 
@@ -61,7 +63,7 @@ def test_smoke_explicit_params():
 
     # Should work on empty sequence with no padding
     serializer = BigEndianAscendingWordSerializer(short_word_length, 0, 0)
-    assert serializer.get_bytes() == []
+    assert serializer.get_bytes() == bytearray()
 
     # Should work on byte-divisible sequence with no padding
     serializer = BigEndianAscendingWordSerializer(short_word_length, 2, 0)
@@ -72,18 +74,18 @@ def test_smoke_explicit_params():
     #   ======
     #   0xBA 0xAA 0xAA 0xAA 0xAA 0xAA 0xAA 0xAC
     #   0x8F 0xFF 0xFF 0xFF 0xFF 0xFF 0xFF 0xF1
-    #  -70 -86 ...                        -84
-    #  -113 -1 ...                        -15
+    #  186 170 ...                        172
+    #  143 255 ...                        241
 
     all_bytes = serializer.get_bytes()
-    expected_bytes = [-70, -86, -86, -86, -86, -86, -86, -84, -113, -1, -1, -1, -1, -1, -1, -15]
+    expected_bytes = bytearray([186, 170, 170, 170, 170, 170, 170, 172, 143, 255, 255, 255, 255, 255, 255, 241])
     assert all_bytes == expected_bytes
 
     # Should pad the array correctly.
     serializer = BigEndianAscendingWordSerializer(short_word_length, 1, 1)
     serializer.write_word(1)
     all_bytes = serializer.get_bytes()
-    expected_bytes = [0, 0, 0, 0, 0, 0, 0, 0, 1]
+    expected_bytes = bytearray([0, 0, 0, 0, 0, 0, 0, 0, 1])
     assert all_bytes == expected_bytes
 
 
@@ -95,7 +97,7 @@ def test_smoke_probabilistic_params():
 
     # Should work on an empty sequence with no padding.
     serializer = BigEndianAscendingWordSerializer(short_word_length, 0, 0)
-    assert serializer.get_bytes() == []
+    assert serializer.get_bytes() == bytearray()
 
     # Should work on a non-byte-divisible sequence with no padding.
     serializer = BigEndianAscendingWordSerializer(short_word_length, 3, 0)
@@ -114,10 +116,10 @@ def test_smoke_probabilistic_params():
     # And the hex/decimal (Are python bytes signed????????):
     # -----------------------------------------------------
     # 0100 1111 -> 0x4F -> 79
-    # 1100 0010 -> 0xC2 -> -62
+    # 1100 0010 -> 0xC2 -> 194
 
     all_bytes = serializer.get_bytes()
-    expected_bytes = [79, -62]
+    expected_bytes = bytearray([79, 194])
     assert all_bytes == expected_bytes
 
     # Should work on a byte-divisible sequence with no padding
@@ -141,13 +143,13 @@ def test_smoke_probabilistic_params():
     # And the hex:
     # ------------
     # 0000 1000 => 0x08 => 8
-    # 1000 0110 => 0x86 => -122
+    # 1000 0110 => 0x86 => 134
     # 0100 0010 => 0x62 => 66
-    # 1001 1000 => 0x98 => -104
-    # 1110 1000 => 0xE8 => -24
+    # 1001 1000 => 0x98 => 152
+    # 1110 1000 => 0xE8 => 232
 
     all_bytes = serializer.get_bytes()
-    expected_bytes = [8, -122, 66, -104, -24]
+    expected_bytes = bytearray([8, 134, 66, 152, 232])
     assert all_bytes == expected_bytes
 
     # Should pad the array correctly
@@ -157,7 +159,7 @@ def test_smoke_probabilistic_params():
     # 1 byte leading padding | value 1 | trailing padding
     # 0000 0000 | 0000 1|000
     all_bytes = serializer.get_bytes()
-    expected_bytes = [0, 8]
+    expected_bytes = bytearray([0, 8])
     assert all_bytes == expected_bytes
 
 
@@ -169,7 +171,7 @@ def test_smoke_sparse_params():
 
     # Should work on an empty sequence with no padding
     serializer = BigEndianAscendingWordSerializer(short_word_length, 0, 0)
-    assert serializer.get_bytes() == []
+    assert serializer.get_bytes() == bytearray()
 
     # Should work on a non-byte-divisible sequence with no padding
     serializer = BigEndianAscendingWordSerializer(short_word_length, 3, 0)
@@ -188,14 +190,14 @@ def test_smoke_sparse_params():
     # -----------------------------------------------------
     # 0000 0000 -> 0x00 -> 0
     # 0000 0100 -> 0x04 -> 4
-    # 1000 0000 -> 0x80 -> -128
+    # 1000 0000 -> 0x80 -> 128
     # 0000 1010 -> 0x0A -> 10
-    # 1000 0000 -> 0x80 -> -128
+    # 1000 0000 -> 0x80 -> 128
     # 0000 1001 -> 0x09 -> 9
     # 0110 0000 -> 0x60 -> 96
 
     all_bytes = serializer.get_bytes()
-    expected_bytes = [0, 4, -128, 10, -128, 9, 96]
+    expected_bytes = bytearray([0, 4, 128, 10, 128, 9, 96])
     assert all_bytes == expected_bytes
 
     # Should work on a byte-divisible sequence with no padding
@@ -221,9 +223,9 @@ def test_smoke_sparse_params():
     # ------------
     # 0000 0000 -> 0x00 -> 0
     # 0000 0000 -> 0x00 -> 0
-    # 1000 0000 -> 0x80 -> -128
+    # 1000 0000 -> 0x80 -> 128
     # 0000 0000 -> 0x00 -> 0
-    # 1000 0000 -> 0x80 -> -128
+    # 1000 0000 -> 0x80 -> 128
     # 0000 0000 -> 0x00 -> 0
     # 0110 0000 -> 0x60 -> 96
     # 0000 0000 -> 0x00 -> 0
@@ -238,7 +240,7 @@ def test_smoke_sparse_params():
     # 0000 1000 -> 0x08 -> 8
 
     all_bytes = serializer.get_bytes()
-    expected_bytes = [0, 0, -128, 0, -128, 0, 96, 0, 64, 0, 40, 0, 24, 0, 14, 0, 8]
+    expected_bytes = bytearray([0, 0, 128, 0, 128, 0, 96, 0, 64, 0, 40, 0, 24, 0, 14, 0, 8])
     assert all_bytes == expected_bytes
 
     # Should pad the array correctly
@@ -246,5 +248,48 @@ def test_smoke_sparse_params():
     serializer.write_word(1)
 
     all_bytes = serializer.get_bytes()
-    expected_bytes = [0, 0, 0, -128]
+    expected_bytes = bytearray([0, 0, 0, 128])
     assert all_bytes == expected_bytes
+
+
+def test_write_words():
+    """
+    Tests that ``write_words()`` packs the same bytes as repeated ``write_word()``,
+    including when the two are interleaved.
+    """
+    random.seed(1)
+    for word_length in [1, 5, 6, 8, 12, 13, 16, 31, 64]:
+        for byte_padding in [0, 3]:
+            word_count = 29
+            words = [random.getrandbits(word_length) for _ in range(word_count)]
+            if word_length == 64:
+                # 64-bit words are written as signed longs
+                words = [word - (1 << 64) if word >= (1 << 63) else word for word in words]
+
+            expected = BigEndianAscendingWordSerializer(word_length, word_count, byte_padding)
+            for word in words:
+                expected.write_word(word)
+
+            serializer = BigEndianAscendingWordSerializer(word_length, word_count, byte_padding)
+            serializer.write_word(words[0])
+            serializer.write_words(words[1:10])
+            serializer.write_words([])
+            serializer.write_word(words[10])
+            serializer.write_words(words[11:])
+
+            assert serializer.get_bytes() == expected.get_bytes()
+
+            # starting on a byte boundary
+            serializer = BigEndianAscendingWordSerializer(word_length, word_count, byte_padding)
+            serializer.write_words(words[:8])
+            serializer.write_words(np.array(words[8:], dtype=np.int64))
+
+            assert serializer.get_bytes() == expected.get_bytes()
+
+    # Should complain if too many words are written
+    serializer = BigEndianAscendingWordSerializer(5, 2, 0)
+    try:
+        serializer.write_words([1, 2, 3])
+        assert False, "Should complain about too many words."
+    except ValueError as e:
+        assert 'Cannot write more words, backing array full!' == str(e)
@@ -310,3 +310,14 @@ def test_left_shift_int():
 
 def test_left_shift_byte():
     assert BitUtil.left_shift_byte(128, 3) == -1024
+
+
+def test_least_significant_bit():
+    assert BitUtil.least_significant_bit(0) == -1
+    assert BitUtil.least_significant_bit(1) == 0
+    assert BitUtil.least_significant_bit(12) == 2
+    assert BitUtil.least_significant_bit(1 << 40) == 40
+    assert BitUtil.least_significant_bit((1 << 63) - 1) == 0
+    assert BitUtil.least_significant_bit(-1) == 0
+    assert BitUtil.least_significant_bit(-8) == 3
+    assert BitUtil.least_significant_bit(-9223372036854775808) == 63  # Long.MIN_VALUE
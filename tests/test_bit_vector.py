@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 from python_hll.util import BitVector
 
 """Unit tests for BitVector."""
@@ -26,3 +28,94 @@ def test_get_set_register():
         assert vector2.get_register(i) == i & 0x1F
         assert vector3.get_register(i) == (127 - i) & 0x1F
         assert vector4.get_register(i) == 0x15
+
+
+def test_register_iterator():
+    """
+    Tests that ``BitVector.register_iterator()`` visits every register in order.
+    """
+    vector = BitVector(5, 2**7)  # width=5, count=2^7
+    for i in range(0, 2**7):
+        vector.set_register(i, (i & 0x1F))
+
+    assert list(vector.register_iterator()) == [i & 0x1F for i in range(0, 2**7)]
+
+
+def test_as_uint8_array():
+    """
+    Tests that ``BitVector.as_uint8_array()`` exposes the registers themselves.
+    """
+    vector = BitVector(5, 2**7)  # width=5, count=2^7
+    vector.set_register(3, 0x15)
+
+    registers = vector.as_uint8_array()
+    assert registers.dtype == np.uint8
+    assert len(registers) == 2**7
+    assert registers[3] == 0x15
+
+    registers[4] = 0x1F
+    assert vector.get_register(4) == 0x1F
+
+
+def test_clone():
+    """
+    Tests that ``BitVector.clone()`` copies the registers.
+    """
+    vector = BitVector(5, 2**7)  # width=5, count=2^7
+    for i in range(0, 2**7):
+        vector.set_register(i, i & 0x1F)
+
+    clone = vector.clone()
+    for i in range(0, 2**7):
+        assert clone.get_register(i) == i & 0x1F
+
+    clone.set_register(0, 0x1F)
+    assert vector.get_register(0) == 0
+
+
+def test_merge_max():
+    """
+    Tests ``BitVector.merge_max()`` and ``BitVector.merge_max_sparse()``.
+    """
+    vector1 = BitVector(5, 2**7)  # width=5, count=2^7
+    vector2 = BitVector(5, 2**7)
+    for i in range(0, 2**7):
+        vector1.set_register(i, i & 0x1F)
+        vector2.set_register(i, (127 - i) & 0x1F)
+
+    vector1.merge_max(vector2)
+    for i in range(0, 2**7):
+        assert vector1.get_register(i) == max(i & 0x1F, (127 - i) & 0x1F)
+
+    vector = BitVector(5, 2**7)
+    vector.set_register(1, 0x15)
+    vector.merge_max_sparse(np.array([0, 1, 0, 2]), np.array([3, 4, 7, 0x1F], dtype=np.uint8))
+    assert vector.get_register(0) == 7
+    assert vector.get_register(1) == 0x15
+    assert vector.get_register(2) == 0x1F
+    assert vector.get_register(3) == 0
+
+    vector.merge_max_sparse(np.array([3, 0, 1]), np.array([2, 9, 4], dtype=np.uint8), distinct=True)
+    assert vector.get_register(0) == 9
+    assert vector.get_register(1) == 0x15
+    assert vector.get_register(2) == 0x1F
+    assert vector.get_register(3) == 2
+
+
+def test_clone_and_merge_sparse():
+    """
+    Tests ``BitVector.clone_and_merge_sparse()``.
+    """
+    vector = BitVector(5, 2**7)  # width=5, count=2^7
+    vector.set_register(0, 7)
+    vector.set_register(1, 0x15)
+
+    clone = vector.clone_and_merge_sparse(np.array([0, 1, 2]), np.array([9, 4, 0x1F], dtype=np.uint8))
+    assert clone.get_register(0) == 9
+    assert clone.get_register(1) == 0x15
+    assert clone.get_register(2) == 0x1F
+    assert clone.get_register(3) == 0
+
+    # the original is untouched
+    assert vector.get_register(0) == 7
+    assert vector.get_register(2) == 0
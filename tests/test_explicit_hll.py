@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import random
+import pickle
+
+import numpy as np
 
 from python_hll.hlltype import HLLType
 from python_hll.hll import HLL
@@ -66,6 +68,21 @@ def test_union():
     hll_a.union(hll_b)
     assert hll_a.get_type() == HLLType.SPARSE
 
+    # Unioning two sets whose union exceeds the SPARSE cap too should promote to FULL
+    hll_a = HLL.create_for_testing(11, 5, 128, 64, HLLType.EXPLICIT)
+    hll_b = HLL.create_for_testing(11, 5, 128, 64, HLLType.EXPLICIT)
+    for i in range(0, 128):
+        hll_a.add_raw((i << 11) | i)  # register i, non-zero value
+        hll_b.add_raw(((i + 128) << 11) | (i + 128))
+
+    hll_a.union(hll_b)
+    assert hll_a.get_type() == HLLType.FULL
+
+    hll = HLL.create_for_testing(11, 5, 128, 64, HLLType.EXPLICIT)
+    for i in range(0, 256):
+        hll.add_raw((i << 11) | i)
+    assert hll_a.to_bytes() == hll.to_bytes()
+
 
 def test_clear():
     """
@@ -77,6 +94,39 @@ def test_clear():
     assert hll.cardinality() == 0
 
 
+def test_clone():
+    """
+    Tests that ``HLL.clone()`` copies the explicit set and shares no storage.
+    """
+    hll = new_hll(128)  # arbitrary
+    hll.add_raw(1)
+    clone = hll.clone()
+    # HLL must be a new-style class for clone() (and __slots__) to work on Python 2
+    assert type(clone) is HLL
+    assert clone.to_bytes() == hll.to_bytes()
+
+    clone.add_raw(2)
+    assert clone.cardinality() == 2
+    assert hll.cardinality() == 1
+
+
+def test_slots_and_pickle():
+    """
+    Tests that ``HLL`` has no per-instance ``__dict__`` and still pickles
+    with every protocol.
+    """
+    hll = new_hll(128)  # arbitrary
+    hll.add_raw(1)
+    assert not hasattr(hll, '__dict__')
+
+    for protocol in range(0, pickle.HIGHEST_PROTOCOL + 1):
+        copy = pickle.loads(pickle.dumps(hll, protocol))
+        assert copy.to_bytes() == hll.to_bytes()
+        copy.add_raw(2)
+        assert copy.cardinality() == 2
+        assert hll.cardinality() == 1
+
+
 def test_to_from_bytes():
     """
     Tests ``HLL.to_bytes() and ``HLL.from_bytes().
@@ -118,6 +168,19 @@ def test_to_from_bytes():
     in_hll = HLL.from_bytes(bytes)
     assert_elements_equal(hll, in_hll)
 
+    # Should write the values in signed ascending order, as Java does
+    values = [-1, 5, -9223372036854775808, 9223372036854775807, 0, -77]
+    hll = new_hll(128)
+    for value in values:
+        hll.add_raw(value)
+
+    bytes = hll.to_bytes(schema_version)
+    deserializer = schema_version.get_deserializer(type, 64, bytes)
+    assert [deserializer.read_word() for _ in values] == sorted(values)
+
+    in_hll = HLL.from_bytes(bytes)
+    assert_elements_equal(hll, in_hll)
+
 
 def test_random_values():
     """
@@ -128,10 +191,9 @@ def test_random_values():
     hll = new_hll(explicit_threshold)
 
     seed = 1  # constant so results are reproducible
-    random.seed(seed)
     max_java_long = 9223372036854775807
-    for i in range(0, explicit_threshold):
-        random_long = random.randint(1, max_java_long)
+    random_longs = np.random.RandomState(seed).randint(1, max_java_long, size=explicit_threshold, dtype=np.int64)
+    for random_long in random_longs.tolist():
         canonical.add(random_long)
         hll.add_raw(random_long)
     canonical_cardinality = len(canonical)
@@ -154,6 +216,25 @@ def test_promotion():
     assert hll.get_type() == HLLType.FULL
 
 
+def test_add_raw_batch_promotion():
+    """
+    Tests promotion from ``HLLType.EXPLICIT`` part way through ``HLL.add_raw_batch()``.
+    """
+    explicit_threshold = 128
+    raw_values = list(range(1, 1001))
+
+    hll = HLL.create_for_testing(11, 5, explicit_threshold, 1024, HLLType.EXPLICIT)
+    for raw_value in raw_values:
+        hll.add_raw(raw_value)
+
+    batch_hll = HLL.create_for_testing(11, 5, explicit_threshold, 1024, HLLType.EXPLICIT)
+    batch_hll.add_raw_batch(raw_values)
+
+    assert batch_hll.get_type() == HLLType.SPARSE
+    assert batch_hll._sparse_probabilistic_storage == hll._sparse_probabilistic_storage
+    assert batch_hll.cardinality() == hll.cardinality()
+
+
 # ------------------------------------------------------------
 # assertion helpers
 
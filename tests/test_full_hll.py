@@ -1,13 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 from __future__ import division
-import pytest
+import random
+import numpy as np
 from math import ceil, log
 from python_hll.hlltype import HLLType
 from python_hll.hll import HLL
 from python_hll.hllutil import HLLUtil
 from python_hll.serialization import SerializationUtil
-from python_hll.util import BitUtil
 import probabilistic_test_util
 
 """Tests ``HLL`` of type ``HLLType.FULL``."""
@@ -19,7 +19,7 @@ def test_small_range_smoke():
     small range correction.
     """
     log2m = 11
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
     regwidth = 5
 
     # only one register set
@@ -35,8 +35,7 @@ def test_small_range_smoke():
 
     # all but one register set
     hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
-    for i in range(0, m - 1):
-        hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, 1))
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, np.arange(0, m - 1), 1))
 
     # Trivially true that small correction conditions hold: all but
     # one register set implies a zero exists, and estimator trivially
@@ -59,13 +58,12 @@ def test_normal_range_smoke():
     # regwidth = 5, so hash space is
     # log2m + (2^5 - 1 - 1), so L = log2m + 30
     L = log2m + 30
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
     hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
 
     # all registers at 'medium' value
     register_value = 7  # chosen to ensure neither correction kicks in
-    for i in range(0, m):
-        hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, register_value))
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, np.arange(0, m), register_value))
 
     cardinality = hll.cardinality()
 
@@ -89,12 +87,11 @@ def test_large_range_smoke():
     # regwidth = 5, so hash space is
     # log2m + (2^5 - 1 - 1), so L = log2m + 30
     L = log2m + 30
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
     hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
 
     register_value = 31  # chosen to ensure large correction kicks in
-    for i in range(0, m):
-        hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, register_value))
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, np.arange(0, m), register_value))
 
     cardinality = hll.cardinality()
 
@@ -209,7 +206,7 @@ def test_clear():
     """
     regwidth = 5
     log2m = 4  # 16 registers per counter
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
 
     hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
     bit_vector = hll._probabilistic_storage
@@ -221,6 +218,28 @@ def test_clear():
         assert bit_vector.get_register(i) == 0  # default value of register
 
 
+def test_union():
+    """
+    Tests ``HLL.union()`` of two ``HLLType.FULL`` HLLs.
+    """
+    log2m = 11  # arbitrary
+    regwidth = 5  # arbitrary
+    m = 1 << log2m
+
+    hll_a = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    hll_b = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    register_indices = np.arange(0, m)
+    hll_a.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, register_indices, (register_indices % 9) + 1))
+    hll_b.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, register_indices, ((m - register_indices) % 13) + 1))
+
+    hll_a.union(hll_b)
+
+    assert hll_a.get_type() == HLLType.FULL
+    for i in range(0, m):
+        assert hll_a._probabilistic_storage.get_register(i) == max((i % 9) + 1, ((m - i) % 13) + 1)
+        assert hll_b._probabilistic_storage.get_register(i) == ((m - i) % 13) + 1  # unchanged
+
+
 # ------------------------------------------------------------
 # Serialization
 
@@ -232,7 +251,7 @@ def test_to_from_bytes():
     schema_version = SerializationUtil.DEFAULT_SCHEMA_VERSION
     type = HLLType.FULL
     padding = schema_version.padding_bytes(type)
-    data_byte_count = probabilistic_test_util.get_required_bytes(regwidth, BitUtil.left_shift_int(1, log2m))  # aka 2^log2m = m
+    data_byte_count = probabilistic_test_util.get_required_bytes(regwidth, 1 << log2m)  # aka 2^log2m = m
     expected_byte_count = padding + data_byte_count
 
     # Should work on an empty element
@@ -264,9 +283,9 @@ def test_to_from_bytes():
     # Should work on a full set
     hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
 
-    for i in range(0, BitUtil.left_shift_int(1, log2m)):
-        raw_value = probabilistic_test_util.construct_hll_value(log2m, i, (i % 9) + 1)
-        hll.add_raw(raw_value)
+    # add_raw_batch() sets the same registers as add_raw(), see test_add_raw_batch()
+    register_indices = np.arange(0, 1 << log2m)
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, register_indices, (register_indices % 9) + 1))
 
     bytes = hll.to_bytes(schema_version)
 
@@ -279,6 +298,111 @@ def test_to_from_bytes():
     assert_elements_equal(hll, in_hll)
 
 
+def test_to_bytes_cache():
+    """
+    Tests that repeated ``HLL.to_bytes()`` calls follow every change to the HLL.
+    """
+    log2m = 11  # arbitrary
+    regwidth = 5
+
+    hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, 1, 3))
+    bytes = hll.to_bytes()
+
+    # the returned bytes are the caller's own
+    bytes[-1] = 99
+    assert hll.to_bytes() != bytes
+    bytes = hll.to_bytes()
+    assert hll.to_bytes() == bytes
+
+    hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, 2, 4))
+    assert hll.to_bytes() != bytes
+    bytes = hll.to_bytes()
+
+    other = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    other.add_raw(probabilistic_test_util.construct_hll_value(log2m, 3, 5))
+    hll.union(other)
+    assert hll.to_bytes() != bytes
+    bytes = hll.to_bytes()
+
+    hll.add_raw_batch([probabilistic_test_util.construct_hll_value(log2m, i, 6) for i in range(0, 100)])
+    assert hll.to_bytes() != bytes
+
+    hll.clear()
+    assert hll.to_bytes() == HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL).to_bytes()
+
+
+def test_clone():
+    """
+    Tests that ``HLL.clone()`` copies the registers and shares no storage.
+    """
+    log2m = 11  # arbitrary
+    regwidth = 5  # arbitrary
+
+    hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, 1, 3))
+    clone = hll.clone()
+    assert clone.to_bytes() == hll.to_bytes()
+    assert_elements_equal(hll, clone)
+
+    clone.add_raw(probabilistic_test_util.construct_hll_value(log2m, 2, 4))
+    assert clone._probabilistic_storage.get_register(2) == 4
+    assert hll._probabilistic_storage.get_register(2) == 0
+    assert clone.cardinality() != hll.cardinality()
+
+
+def test_add_raw_batch():
+    """
+    Tests that ``HLL.add_raw_batch()`` sets the same registers as ``HLL.add_raw()``.
+    """
+    log2m = 11  # arbitrary
+    regwidth = 5  # arbitrary
+
+    random.seed(1)
+    min_java_long = -9223372036854775808
+    max_java_long = 9223372036854775807
+    raw_values = [random.randint(min_java_long, max_java_long) for i in range(0, 10000)]
+    raw_values.append(0)  # p(0x0) is ignored
+
+    hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    for raw_value in raw_values:
+        hll.add_raw(raw_value)
+
+    batch_hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.FULL)
+    batch_hll.add_raw_batch(np.array(raw_values, dtype=np.int64))
+
+    assert_elements_equal(hll, batch_hll)
+
+
+def test_maintained_cardinality():
+    """
+    Tests that the indicator function maintained by ``HLL.add_raw()`` matches
+    one recomputed from the registers.
+    """
+    log2m = 11  # arbitrary
+    regwidth = 5  # arbitrary
+
+    random.seed(1)
+    min_java_long = -9223372036854775808
+    max_java_long = 9223372036854775807
+
+    # starts SPARSE so that promotion to FULL is covered as well
+    hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.SPARSE)
+    for i in range(0, 20000):
+        hll.add_raw(random.randint(min_java_long, max_java_long))
+        if i % 1000 == 0:
+            indicator_sum = hll._indicator_sum
+            number_of_zeroes = hll._number_of_zeroes
+            cardinality = hll.cardinality()
+
+            hll._compute_indicator()
+            if indicator_sum is not None:
+                assert indicator_sum == hll._indicator_sum
+                assert number_of_zeroes == hll._number_of_zeroes
+            assert cardinality == hll.cardinality()
+    assert hll.get_type() == HLLType.FULL
+
+
 # ------------------------------------------------------------
 # Assertion Helpers
 
@@ -287,23 +411,4 @@ def assert_elements_equal(hll_a, hll_b):
     bit_vector_a = hll_a._probabilistic_storage
     bit_vector_b = hll_b._probabilistic_storage
 
-    iter_a = bit_vector_a.register_iterator()
-    iter_b = bit_vector_b.register_iterator()
-
-    try:
-        while True:
-            assert iter_a.next() == iter_b.next()
-    except StopIteration:
-        pass
-
-    try:
-        iter_a.next()
-        pytest.fail()
-    except StopIteration:
-        pass
-
-    try:
-        iter_b.next()
-        pytest.fail()
-    except StopIteration:
-        pass
+    assert np.array_equal(bit_vector_a._registers, bit_vector_b._registers)
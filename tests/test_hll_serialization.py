@@ -3,11 +3,12 @@
 
 """Serialization smoke-tests."""
 
-import random
 import sys
-from copy import deepcopy
+from itertools import product
+import numpy as np
 from python_hll.hlltype import HLLType
 from python_hll.hll import HLL
+from python_hll.serialization import SerializationUtil
 
 # A fixed random seed so that this test is reproducible.
 RANDOM_SEED = 1
@@ -18,16 +19,31 @@ def test_serialization_smoke(fastonly):
     A smoke-test that covers serialization/deserialization of an HLL
     under all possible parameters.
     """
-    random.seed(RANDOM_SEED)
     random_count = 250
     max_java_long = 9223372036854775807
-    randoms = [random.randint(1, max_java_long) for i in range(0, random_count)]
+    randoms = np.random.RandomState(RANDOM_SEED).randint(1, max_java_long, size=random_count, dtype=np.int64)
     assert_cardinality(HLLType.EMPTY, randoms, fastonly)
     assert_cardinality(HLLType.EXPLICIT, randoms, fastonly)
     assert_cardinality(HLLType.SPARSE, randoms, fastonly)
     assert_cardinality(HLLType.FULL, randoms, fastonly)
 
 
+def test_metadata():
+    """
+    Tests that the metadata read back from a serialized HLL matches its
+    parameters, and that ``HLLMetadata`` has no per-instance ``__dict__``.
+    """
+    hll = HLL(11, 5, 0, True, HLLType.SPARSE)  # arbitrary
+    schema_version = SerializationUtil.DEFAULT_SCHEMA_VERSION
+    metadata = schema_version.read_metadata(hll.to_bytes(schema_version))
+    assert not hasattr(metadata, '__dict__')
+    assert metadata.hll_type() == HLLType.SPARSE
+    assert metadata.register_count_log2() == 11
+    assert metadata.register_width() == 5
+    assert metadata.explicit_off()
+    assert metadata.sparse_enabled()
+
+
 def assert_cardinality(hll_type, items, fastonly):
     # NOTE: log2m<=16 was chosen as the max log2m parameter so that the test
     #       completes in a reasonable amount of time. Not much is gained by
@@ -40,22 +56,22 @@ def assert_cardinality(hll_type, items, fastonly):
         log2m_range = (HLL.MINIMUM_LOG2M_PARAM, 16)
         regw_range = (HLL.MINIMUM_REGWIDTH_PARAM, HLL.MAXIMUM_REGWIDTH_PARAM)
         expthr_range = (HLL.MINIMUM_EXPTHRESH_PARAM, HLL.MAXIMUM_EXPTHRESH_PARAM)
-    for log2m in log2m_range:
-        for regw in regw_range:
-            for expthr in expthr_range:
-                for sparse in [True, False]:
-                    hll = HLL(log2m, regw, expthr, sparse, hll_type)
-                    for item in items:
-                        hll.add_raw(item)
-                    copy = HLL.from_bytes(hll.to_bytes())
-                    assert copy.cardinality() == hll.cardinality()
-                    assert copy.get_type() == hll.get_type()
-                    assert copy.to_bytes() == hll.to_bytes()
-
-                    clone = deepcopy(hll)
-                    assert clone.cardinality() == hll.cardinality()
-                    assert clone.get_type() == hll.get_type()
-                    assert clone.to_bytes() == hll.to_bytes()
-
-                    sys.stdout.write('.')
-                    sys.stdout.flush()
+    # A FULL HLL is never demoted so the sparse flag only changes a metadata
+    # bit, which the other types already cover with sparse off.
+    sparse_range = (True,) if hll_type == HLLType.FULL else (True, False)
+    for log2m, regw, expthr in product(log2m_range, regw_range, expthr_range):
+        for sparse in sparse_range:
+            hll = HLL(log2m, regw, expthr, sparse, hll_type)
+            hll.add_raw_batch(items)
+            copy = HLL.from_bytes(hll.to_bytes())
+            assert copy.cardinality() == hll.cardinality()
+            assert copy.get_type() == hll.get_type()
+            assert copy.to_bytes() == hll.to_bytes()
+
+            clone = hll.clone()
+            assert clone.cardinality() == hll.cardinality()
+            assert clone.get_type() == hll.get_type()
+            assert clone.to_bytes() == hll.to_bytes()
+
+            sys.stdout.write('.')
+            sys.stdout.flush()
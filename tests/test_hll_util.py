@@ -1,5 +1,7 @@
 """Tests ``HLLUtil`` static methods."""
 
+from math import log
+import numpy as np
 from python_hll.hll import HLL
 from python_hll.hllutil import HLLUtil
 
@@ -8,14 +10,63 @@ def test_large_estimator_cutoff():
     """
     Tests that ``HLLUtil.largeEstimatorCutoff()`` is the same
     as a trivial implementation.
+
+    See blog post (http://research.neustar.biz/2013/01/24/hyperloglog-googles-take-on-engineering-hll/)
+    and original paper (Fig. 3) for information on 2^L and
+    large range correction cutoff.
+    """
+    log2ms, regwidths = np.meshgrid(
+        np.arange(HLL.MINIMUM_LOG2M_PARAM, HLL.MAXIMUM_LOG2M_PARAM + 1),
+        np.arange(HLL.MINIMUM_REGWIDTH_PARAM, HLL.MAXIMUM_REGWIDTH_PARAM + 1),
+        indexing='ij')
+    # L = (2^regwidth - 2) + log2m, see HLLUtil.TWO_TO_L
+    expected = np.exp2((2 ** regwidths - 2) + log2ms) / 30.0
+    for (i, j), log2m in np.ndenumerate(log2ms):
+        assert HLLUtil.large_estimator_cutoff(int(log2m), int(regwidths[i, j])) == expected[i, j]
+
+
+def test_cached_constants():
+    """
+    Tests that the constants ``HLL`` caches at construction are those of ``HLLUtil``.
+    """
+    for log2m in range(HLL.MINIMUM_LOG2M_PARAM + 1, 18):
+        for regwidth in range(HLL.MINIMUM_REGWIDTH_PARAM + 1, HLL.MAXIMUM_REGWIDTH_PARAM + 1):
+            hll = HLL(log2m, regwidth)
+            m = 1 << log2m
+            assert hll._pw_max_mask == HLLUtil.pw_max_mask(regwidth)
+            assert hll._alpha_m_squared == HLLUtil.alpha_m_squared(m)
+            assert hll._small_estimator_cutoff == HLLUtil.small_estimator_cutoff(m)
+            assert hll._large_estimator_cutoff == HLLUtil.large_estimator_cutoff(log2m, regwidth)
+
+
+def test_alpha_m_squared():
     """
-    for log2m in range(HLL.MINIMUM_LOG2M_PARAM + 1, HLL.MAXIMUM_LOG2M_PARAM + 1):
-        for regWidth in range(HLL.MINIMUM_REGWIDTH_PARAM + 1, HLL.MINIMUM_REGWIDTH_PARAM + 1):
-            cutoff = HLLUtil.large_estimator_cutoff(log2m, regWidth)
-            """
-            See blog post (http://research.neustar.biz/2013/01/24/hyperloglog-googles-take-on-engineering-hll/)
-            and original paper (Fig. 3) for information on 2^L and
-            large range correction cutoff.
-            """
-            expected = (regWidth ** regWidth) - (2 + log2m) / 30.0
-            assert cutoff == expected
+    Tests ``HLLUtil.alpha_m_squared()`` against the constants of the paper.
+    """
+    assert HLLUtil.alpha_m_squared(16) == 0.673 * 16 * 16
+    assert HLLUtil.alpha_m_squared(32) == 0.697 * 32 * 32
+    assert HLLUtil.alpha_m_squared(64) == 0.709 * 64 * 64
+    for log2m in range(7, HLL.MAXIMUM_LOG2M_PARAM + 1):
+        m = 1 << log2m
+        assert HLLUtil.alpha_m_squared(m) == (0.7213 / (1.0 + 1.079 / m)) * m * m
+
+    try:
+        HLLUtil.alpha_m_squared(8)
+        assert False, "Should complain about too few registers."
+    except Exception as e:
+        assert "'m' cannot be less than 16" in str(e)
+
+
+def test_large_estimator():
+    """
+    Tests ``HLLUtil.large_estimator()`` inside and at the edge of its domain.
+    """
+    log2m, regwidth = 11, 5
+    two_to_l = 2 ** ((2 ** regwidth) - 2 + log2m)  # 2^L in the blog post
+
+    estimator = two_to_l / 2.0
+    assert HLLUtil.large_estimator(log2m, regwidth, estimator) == -1 * two_to_l * log(0.5)
+
+    # no correction once the estimator reaches 2^L
+    assert HLLUtil.large_estimator(log2m, regwidth, two_to_l) == 0
+    assert HLLUtil.large_estimator(log2m, regwidth, 2 * two_to_l) == 0
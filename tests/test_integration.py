@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import csv
+from itertools import islice
+import numpy as np
 import pytest
 import sys
 from python_hll.util import NumberUtil
@@ -19,6 +21,9 @@ REGWIDTH = 5
 EXPLICIT_THRESHOLD = 256
 SPARSE_THRESHOLD = 850
 
+# parsed rows of the test data files, by file name and row limit (see ``read_rows()``)
+_ROWS = {}
+
 
 def test_cumulative_add_cardinality_correction(fastonly):
     do_test_add('cumulative_add_cardinality_correction.csv', fastonly)
@@ -71,9 +76,7 @@ def test_cumulative_union_sparse_full_representation():
 
     # The file is generated from IntegrationTestGenerator.java.
     filename = 'cumulative_union_sparse_full_representation.csv'
-    with open('tests/data/%s' % filename, mode='r') as csv_file:
-        csv_reader = csv.DictReader(csv_file)
-        rows = [row for row in csv_reader]
+    rows = read_rows(filename)
     print('')
     print('test_integration: %s: %s rows:' % (filename, len(rows)))
 
@@ -93,9 +96,9 @@ def test_cumulative_union_sparse_full_representation():
     assert_sparse_full_row_equals(full_hll_2, sparse_hll, rows[2], filename, 3)
 
     full_hll_3 = new_hll(HLLType.FULL)
-    for i in range(2, SPARSE_THRESHOLD + 1):
-        full_hll_3.add_raw(probabilistic_test_util.construct_hll_value(LOG2M, i, 1))
-        sparse_hll.add_raw(probabilistic_test_util.construct_hll_value(LOG2M, i, 1))
+    raw_values = probabilistic_test_util.construct_hll_values(LOG2M, np.arange(2, SPARSE_THRESHOLD + 1), 1)
+    full_hll_3.add_raw_batch(raw_values)
+    sparse_hll.add_raw_batch(raw_values)
     assert_sparse_full_row_equals(full_hll_3, sparse_hll, rows[3], filename, 4)
 
 
@@ -120,60 +123,72 @@ def new_hll(type):
     return HLL.create_for_testing(LOG2M, REGWIDTH, EXPLICIT_THRESHOLD, SPARSE_THRESHOLD, type)
 
 
+def read_rows(filename, limit=None):
+    """
+    Reads the rows of a file in the data directory, parsing each file only once.
+
+    :param int limit: the maximum number of rows to read, or ``None`` to read
+           them all. Rows past the limit are never parsed.
+    :returns: the rows as dicts keyed by column name.
+    :rtype: list
+    """
+    rows = _ROWS.get((filename, limit))
+    if rows is None:
+        with open('tests/data/%s' % filename, mode='r') as csv_file:
+            rows = _ROWS[(filename, limit)] = list(islice(csv.DictReader(csv_file), limit))
+    return rows
+
+
 def do_test_add(filename, fastonly):
     """
     Tests an "add"-style test file.
+
+    NOTE:  each row starts from the previous row's expected HLL. Since the HLL
+           was just asserted to serialize to exactly that, it is reused rather
+           than deserialized again.
     """
-    with open('tests/data/%s' % filename, mode='r') as csv_file:
-        csv_reader = csv.DictReader(csv_file)
-        line = 1
-        rows = [row for row in csv_reader]
-        if fastonly:
-            rows = rows[0:500]
-        print('')
-        print('test_integration: %s: %s rows: (each . = 100 rows)' % (filename, len(rows)))
-        for row in rows:
-            if line == 1:
-                hll = string_to_hll(row['multiset'])
-                line += 1
-                continue
-            hll.add_raw(int(row['raw_value']))
-            assert float_cardinality(hll) == pytest.approx(float(row['cardinality'])), '%s:%s' % (filename, line)
-            assert hll_to_string(hll) == row['multiset'], '%s:%s' % (filename, line)
+    line = 1
+    rows = read_rows(filename, 500 if fastonly else None)
+    print('')
+    print('test_integration: %s: %s rows: (each . = 100 rows)' % (filename, len(rows)))
+    for row in rows:
+        if line == 1:
             hll = string_to_hll(row['multiset'])
             line += 1
-            if line % 100 == 0:
-                sys.stdout.write('.')
-                sys.stdout.flush()
+            continue
+        hll.add_raw(int(row['raw_value']))
+        assert float_cardinality(hll) == pytest.approx(float(row['cardinality'])), '%s:%s' % (filename, line)
+        assert hll_to_string(hll) == row['multiset'], '%s:%s' % (filename, line)
+        line += 1
+        if line % 1000 == 0:
+            sys.stdout.write('..........')
+            sys.stdout.flush()
 
 
 def do_test_union(filename, fastonly):
     """
     Tests an "union"-style test file.
+
+    NOTE:  as in ``do_test_add()`` the union HLL is carried over between rows.
     """
-    with open('tests/data/%s' % filename, mode='r') as csv_file:
-        csv_reader = csv.DictReader(csv_file)
-        line = 1
-        rows = [row for row in csv_reader]
-        if fastonly:
-            rows = rows[0:500]
-        print('')
-        print('test_integration: %s: %s rows: (each . = 100 rows)' % (filename, len(rows)))
-        for row in rows:
-            if line == 1:
-                hll = string_to_hll(row['union_multiset'])
-                line += 1
-                continue
-            other_hll = string_to_hll(row['multiset'])
-            assert float_cardinality(other_hll) == pytest.approx(float(row['cardinality'])), '%s:%s:multiset' % (filename, line)
-            hll.union(other_hll)
-            assert float_cardinality(hll) == pytest.approx(float(row['union_cardinality'])), '%s:%s' % (filename, line)
-            assert hll_to_string(hll) == row['union_multiset'], '%s:%s' % (filename, line)
+    line = 1
+    rows = read_rows(filename, 500 if fastonly else None)
+    print('')
+    print('test_integration: %s: %s rows: (each . = 100 rows)' % (filename, len(rows)))
+    for row in rows:
+        if line == 1:
             hll = string_to_hll(row['union_multiset'])
             line += 1
-            if line % 100 == 0:
-                sys.stdout.write('.')
-                sys.stdout.flush()
+            continue
+        other_hll = string_to_hll(row['multiset'])
+        assert float_cardinality(other_hll) == pytest.approx(float(row['cardinality'])), '%s:%s:multiset' % (filename, line)
+        hll.union(other_hll)
+        assert float_cardinality(hll) == pytest.approx(float(row['union_cardinality'])), '%s:%s' % (filename, line)
+        assert hll_to_string(hll) == row['union_multiset'], '%s:%s' % (filename, line)
+        line += 1
+        if line % 1000 == 0:
+            sys.stdout.write('..........')
+            sys.stdout.flush()
 
 
 def float_cardinality(hll):
@@ -187,16 +202,19 @@ def float_cardinality(hll):
               compatible String. This will never be ``None``
     :rtype: float
     """
-    if hll.get_type() == HLLType.EMPTY:
-        return 0
-    elif hll.get_type() == HLLType.EXPLICIT:  # promotion has not yet occurred
-        return hll.cardinality()
-    elif hll.get_type() == HLLType.SPARSE:
-        return hll._sparse_probabilistic_algorithm_cardinality()
-    elif hll.get_type() == HLLType.FULL:
-        return hll._full_probabilistic_algorithm_cardinality()
-    else:
+    float_cardinality_impl = _FLOAT_CARDINALITY_IMPLS.get(hll.get_type())
+    if float_cardinality_impl is None:
         raise Exception('Unknown HLL type ' + str(hll.get_type()))
+    return float_cardinality_impl(hll)
+
+
+# ``float_cardinality()`` implementations by HLL type
+_FLOAT_CARDINALITY_IMPLS = {
+    HLLType.EMPTY: lambda hll: 0,
+    HLLType.EXPLICIT: HLL.cardinality,  # promotion has not yet occurred
+    HLLType.SPARSE: HLL._sparse_probabilistic_algorithm_cardinality,
+    HLLType.FULL: HLL._full_probabilistic_algorithm_cardinality,
+}
 
 
 def string_to_hll(s):
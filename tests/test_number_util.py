@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests ``NumberUtil`` static methods."""
+
+from python_hll.util import NumberUtil
+
+
+def test_from_hex():
+    assert NumberUtil.from_hex('0aFf10', 0, 6) == bytearray([0x0A, 0xFF, 0x10])
+    assert NumberUtil.from_hex('0aFf10', 2, 4) == bytearray([0xFF, 0x10])
+    assert NumberUtil.from_hex('0aFf10', 0, 2) == bytearray([0x0A])
+
+    try:
+        NumberUtil.from_hex('0G', 0, 2)
+        assert False, "Should complain about a non-hex character."
+    except Exception as e:
+        assert "Character is not in [a-fA-F0-9]: (G)" == str(e)
+
+    try:
+        NumberUtil.from_hex(u'0\u00e9', 0, 2)
+        assert False, "Should complain about a non-ASCII character."
+    except Exception as e:
+        assert "Character is not in [a-fA-F0-9]: (\\xe9)" == str(e)
+
+    try:
+        NumberUtil.from_hex(u'0\u20ac', 0, 2)
+        assert False, "Should complain about a non-ASCII character."
+    except Exception as e:
+        assert "Character is not in [a-fA-F0-9]: (\\u20ac)" == str(e)
+
+
+def test_to_hex():
+    assert NumberUtil.to_hex(bytearray([0x00, 0x0A, 0xFF]), 0, 3) == '000AFF'
+    assert NumberUtil.to_hex(bytearray([0x00, 0x0A, 0xFF]), 1, 5) == '0AFF'
+    assert NumberUtil.to_hex([0, -1, 16], 1, 1) == 'FF'  # Java's signed bytes
+
+
+def test_log2():
+    for i in range(64):
+        assert NumberUtil.log2(1 << i) == i
+    assert abs(NumberUtil.log2(10) - 3.321928094887362) < 1e-12
+    assert abs(NumberUtil.log2(0.5) - -1.0) < 1e-12
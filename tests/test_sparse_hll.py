@@ -3,6 +3,7 @@
 from __future__ import division
 from math import ceil, log
 import random
+import numpy as np
 from python_hll.hlltype import HLLType
 from python_hll.hll import HLL
 from python_hll.hllutil import HLLUtil
@@ -101,7 +102,7 @@ def test_small_range_smoke():
     range correction.
     """
     log2m = 11
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
     regwidth = 5
 
     # ------------------------------------------------------------
@@ -120,8 +121,7 @@ def test_small_range_smoke():
     # ------------------------------------------------------------
     # all but one register set
     hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.SPARSE)
-    for i in range(0, m - 1):
-        hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, 1))
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, np.arange(0, m - 1), 1))
 
     # Trivially true that small correction conditions hold: all but
     # one register set implies a zero exists, and estimator trivially
@@ -139,7 +139,7 @@ def test_normal_range_smoke():
     uncorrected estimator.
     """
     log2m = 11
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
     regwidth = 5
     # regwidth = 5, so hash space is
     # log2m + (2^5 - 1 - 1), so L = log2m + 30
@@ -149,8 +149,7 @@ def test_normal_range_smoke():
     hll = HLL.create_for_testing(log2m, regwidth, 128, m, HLLType.SPARSE)
 
     register_value = 7  # chosen to ensure neither correction kicks in
-    for i in range(0, m):
-        hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, register_value))
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, np.arange(0, m), register_value))
 
     cardinality = hll.cardinality()
 
@@ -171,7 +170,7 @@ def test_large_range_smoke():
     range correction.
     """
     log2m = 11
-    m = BitUtil.left_shift_int(1, log2m)
+    m = 1 << log2m
     regwidth = 5
     # regwidth = 5, so hash space is
     # log2m + (2^5 - 1 - 1), so L = log2m + 30
@@ -181,8 +180,7 @@ def test_large_range_smoke():
     hll = HLL.create_for_testing(log2m, regwidth, 128, m, HLLType.SPARSE)
 
     register_value = 31  # chosen to ensure large correction kicks in
-    for i in range(0, m):
-        hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, register_value))
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, np.arange(0, m), register_value))
 
     cardinality = hll.cardinality()
 
@@ -277,9 +275,9 @@ def test_union():
     hll_b = HLL.create_for_testing(log2m, 5, 128, sparse_threshold, HLLType.SPARSE)
 
     # fill up sets to maxCapacity
-    for i in range(0, sparse_threshold):
-        hll_a.add_raw(probabilistic_test_util.construct_hll_value(log2m, i, 1))
-        hll_b.add_raw(probabilistic_test_util.construct_hll_value(log2m, i + sparse_threshold, 1))  # non-overlapping
+    register_indices = np.arange(0, sparse_threshold)
+    hll_a.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, register_indices, 1))
+    hll_b.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, register_indices + sparse_threshold, 1))  # non-overlapping
 
     hll_a.union(hll_b)
 
@@ -296,6 +294,21 @@ def test_clear():
     assert hll.cardinality() == 0
 
 
+def test_clone():
+    """
+    Tests that ``HLL.clone()`` copies the registers and shares no storage.
+    """
+    hll = HLL.create_for_testing(log2m, 5, 128, 256, HLLType.SPARSE)
+    hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, 1, 3))
+    clone = hll.clone()
+    assert type(clone) is HLL
+    assert_elements_equal(hll, clone)
+
+    clone.add_raw(probabilistic_test_util.construct_hll_value(log2m, 2, 4))
+    assert_register_present(clone, 2, 4)
+    assert_register_present(hll, 2, 0)
+
+
 def test_to_from_bytes():
     """
     Tests ``HLL.to_bytes()`` and ``HLL.from_bytes()``.
@@ -343,9 +356,8 @@ def test_to_from_bytes():
     # Should work on a full set
     hll = HLL.create_for_testing(log2m, regwidth, 128, sparse_threshold, HLLType.SPARSE)
 
-    for i in range(0, sparse_threshold):
-        raw_value = probabilistic_test_util.construct_hll_value(log2m, i, (i % 9) + 1)
-        hll.add_raw(raw_value)
+    register_indices = np.arange(0, sparse_threshold)
+    hll.add_raw_batch(probabilistic_test_util.construct_hll_values(log2m, register_indices, (register_indices % 9) + 1))
 
     bytes = hll.to_bytes(schema_version)
 
@@ -358,33 +370,90 @@ def test_to_from_bytes():
     assert_elements_equal(hll, in_hll)
 
 
+def test_to_from_bytes_unsigned_registers():
+    """
+    Tests that register values that do not fit a signed byte survive
+    ``HLL.to_bytes()`` and ``HLL.from_bytes()``.
+    """
+    hll = HLL.create_for_testing(11, 8, 128, 256, HLLType.SPARSE)
+    hll._sparse_probabilistic_storage[5] = 200
+
+    in_hll = HLL.from_bytes(hll.to_bytes())
+    assert_one_register_set(in_hll, 5, 200)
+
+
+def test_from_bytes_skips_zero_registers():
+    """
+    Tests that ``HLL.from_bytes()`` does not store the short words of
+    zero-valued registers (e.g. trailing padding read as a register).
+    """
+    regwidth = 5
+    hll = HLL.create_for_testing(log2m, regwidth, 128, 256, HLLType.SPARSE)
+    hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, 7, 3))
+    hll.add_raw(probabilistic_test_util.construct_hll_value(log2m, 9, 1))
+    bytes = hll.to_bytes()
+
+    # rewrite the stored words with a zero-valued register between them
+    schema_version = SerializationUtil.DEFAULT_SCHEMA_VERSION
+    serializer = schema_version.get_serializer(HLLType.SPARSE, log2m + regwidth, 3)
+    serializer.write_words([(7 << regwidth) | 3, (8 << regwidth) | 0, (9 << regwidth) | 1])
+    padded_bytes = serializer.get_bytes()
+    padded_bytes[:schema_version.padding_bytes(HLLType.SPARSE)] = bytes[:schema_version.padding_bytes(HLLType.SPARSE)]
+
+    in_hll = HLL.from_bytes(padded_bytes)
+    assert dict(in_hll._sparse_probabilistic_storage) == {7: 3, 9: 1}
+    assert in_hll.to_bytes() == bytes
+
+
 def test_random_values():
     log2m = 11  # arbitrary
     regwidth = 5  # arbitrary
     sparse_threshold = 256  # arbitrary
 
     seed = 1
-    random.seed(seed)
+    run_count = 100
     max_java_long = 9223372036854775807
+    m = 1 << log2m
+    # one row of raw values per run
+    all_raw_values = np.random.RandomState(seed).randint(1, max_java_long, size=(run_count, sparse_threshold), dtype=np.int64)
 
-    for run in range(0, 100):
+    for raw_values in all_raw_values:
         hll = HLL.create_for_testing(log2m, regwidth, 128, sparse_threshold, HLLType.SPARSE)
 
-        map = {}
+        # the expected registers, i.e. the largest value per register index
+        expected = np.zeros(m, dtype=np.int8)
+        np.maximum.at(expected, raw_values & (m - 1), probabilistic_test_util.get_register_values(raw_values, log2m))
 
-        for i in range(0, sparse_threshold):
-            raw_value = random.randint(1, max_java_long)
+        for raw_value in raw_values.tolist():
+            hll.add_raw(raw_value)
 
-            register_index = probabilistic_test_util.get_register_index(raw_value, log2m)
-            register_value = probabilistic_test_util.get_register_value(raw_value, log2m)
-            if map.get(register_index, 0) < register_value:
-                map[register_index] = register_value
+        for key in np.flatnonzero(expected).tolist():
+            assert_register_present(hll, key, int(expected[key]))
 
-            hll.add_raw(raw_value)
 
-        for key in map.keys():
-            expected_register_value = map.get(key, 0)
-            assert_register_present(hll, key, expected_register_value)
+def test_add_raw_batch():
+    """
+    Tests that ``HLL.add_raw_batch()`` sets the same registers as ``HLL.add_raw()``.
+    """
+    log2m = 11  # arbitrary
+    regwidth = 5  # arbitrary
+    sparse_threshold = 256  # arbitrary
+
+    random.seed(1)
+    min_java_long = -9223372036854775808
+    max_java_long = 9223372036854775807
+    raw_values = [random.randint(min_java_long, max_java_long) for i in range(0, sparse_threshold)]
+
+    hll = HLL.create_for_testing(log2m, regwidth, 128, sparse_threshold, HLLType.SPARSE)
+    for raw_value in raw_values:
+        hll.add_raw(raw_value)
+
+    batch_hll = HLL.create_for_testing(log2m, regwidth, 128, sparse_threshold, HLLType.SPARSE)
+    batch_hll.add_raw_batch(raw_values)
+
+    assert batch_hll.get_type() == HLLType.SPARSE
+    assert_elements_equal(hll, batch_hll)
+
 
 # ------------------------------------------------------------
 # assertion helpers
@@ -410,6 +479,4 @@ def assert_one_register_set(hll, register_index, register_value):
 def assert_elements_equal(hll_a, hll_b):
     sparse_probabilistic_storage_a = hll_a._sparse_probabilistic_storage
     sparse_probabilistic_storage_b = hll_b._sparse_probabilistic_storage
-    assert len(sparse_probabilistic_storage_a) == len(sparse_probabilistic_storage_b)
-    for index in sparse_probabilistic_storage_a.keys():
-        assert sparse_probabilistic_storage_a.get(index) == sparse_probabilistic_storage_b.get(index)
+    assert dict(sparse_probabilistic_storage_a) == dict(sparse_probabilistic_storage_b)